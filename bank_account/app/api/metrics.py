@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from app.core.db import pool_metrics
+from app.core.metrics import transaction_metrics
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("/db-pool")
+async def db_pool_metrics_route():
+    return pool_metrics.snapshot()
+
+
+@router.get("/transactions")
+async def transaction_metrics_route():
+    return transaction_metrics.snapshot()
@@ -1,33 +1,71 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
-from app.schema import AccountCreate, AccountDetail, Transaction
+from app.schema import (
+    AccountCreate,
+    AccountDetail,
+    BatchRequest,
+    BatchResult,
+    HistoricalBalance,
+    Statement,
+    Transaction,
+)
 from app.service.account_service import (
     create_account,
     deposit,
     get_account_detail,
+    get_account_statement,
+    get_historical_balance,
     withdraw,
 )
+from app.service.batch_service import apply_batch
 
 router = APIRouter(prefix="/accounts")
 
 
-@router.post("/create/")
-async def create_account_route(account: AccountCreate, db: Session = Depends(get_db)):
-    return create_account(account, db)
+@router.post("/create/", response_model=AccountDetail)
+async def create_account_route(
+    account: AccountCreate, db: AsyncSession = Depends(get_db)
+):
+    return await create_account(account, db)
+
+
+@router.post("/batch", response_model=BatchResult)
+async def batch_route(batch: BatchRequest, db: AsyncSession = Depends(get_db)):
+    return await apply_batch(batch, db)
+
+
+@router.post("/{account_number}/deposit/", response_model=AccountDetail)
+async def deposit_route(account: Transaction, db: AsyncSession = Depends(get_db)):
+    return await deposit(account, db)
+
+
+@router.post("/{account_number}/withdraw/", response_model=AccountDetail)
+async def withdraw_route(account: Transaction, db: AsyncSession = Depends(get_db)):
+    return await withdraw(account, db)
 
 
-@router.post("/{account_number}/deposit/")
-async def deposit_route(account: Transaction, db: Session = Depends(get_db)):
-    return deposit(account, db)
+@router.get("/accounts/{account_number}/", response_model=AccountDetail)
+async def get_account_route(account: AccountDetail, db: AsyncSession = Depends(get_db)):
+    return await get_account_detail(account, db)
 
 
-@router.post("/{account_number}/withdraw/")
-async def withdraw_route(account: Transaction, db: Session = Depends(get_db)):
-    return withdraw(account, db)
+@router.get("/{account_number}/statement", response_model=Statement)
+async def get_statement_route(
+    account_number: str,
+    before: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_account_statement(account_number, before, limit, db)
 
 
-@router.get("/accounts/{account_number}/")
-async def get_account_route(account: AccountDetail, db: Session = Depends(get_db)):
-    return get_account_detail(account, db)
+@router.get("/{account_number}/balance", response_model=HistoricalBalance)
+async def get_balance_route(
+    account_number: str, at: datetime, db: AsyncSession = Depends(get_db)
+):
+    return await get_historical_balance(account_number, at, db)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,9 +12,30 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # optimistic: 클라이언트 version 비교, atomic: 조건부 UPDATE ... RETURNING
+    # serialized: 계좌별 대기열에서 모아서 한 트랜잭션으로 적용
+    TRANSACTION_MODE: Literal["optimistic", "atomic", "serialized"] = "optimistic"
+    TRANSACTION_BATCH_MAX: int = 100
+
+    # /accounts/batch 한 번에 받을 수 있는 거래 수
+    BATCH_MAX_TRANSACTIONS: int = 10000
+
+    # 이 version 간격마다 잔액 스냅샷을 남긴다
+    LEDGER_SNAPSHOT_EVERY: int = 100
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
 
 settings = Settings()
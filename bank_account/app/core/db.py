@@ -1,19 +1,31 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import PoolMetrics
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
+pool_metrics = PoolMetrics(engine.sync_engine)
+
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
+        # 커넥션을 미리 확보해 풀 대기 시간을 측정
+        started_at = time.perf_counter()
+        await db.connection()
+        pool_metrics.observe_wait(started_at)
         yield db
-    finally:
-        db.close()
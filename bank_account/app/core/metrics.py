@@ -0,0 +1,109 @@
+import bisect
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 커넥션 대기 시간 버킷(초)
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# 체크아웃된 커넥션 / overflow 개수 버킷
+CONNECTION_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+# serialized 모드에서 한 트랜잭션에 모인 거래 수 버킷
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        # Prometheus와 같은 누적(le) 버킷 형태로 반환
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+class PoolMetrics:
+    """커넥션 풀 사용량, 거래 모드마다 커넥션을 잡고 있는 시간이 달라 모드별로 비교하는 용도
+
+    serialized 모드의 drain 태스크는 get_db를 거치지 않으므로 대기 시간에는 빠지고
+    체크아웃 분포에만 잡힌다.
+    """
+
+    def __init__(self, engine: Engine):
+        self.pool = engine.pool
+        self.checked_out = Histogram(CONNECTION_BUCKETS)
+        self.overflow = Histogram(CONNECTION_BUCKETS)
+        self.wait_time = Histogram(WAIT_TIME_BUCKETS)
+        self.connects = 0
+        self.invalidations = 0
+
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checked_out.observe(self.pool.checkedout())
+        self.overflow.observe(max(self.pool.overflow(), 0))
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def observe_wait(self, started_at: float):
+        self.wait_time.observe(time.perf_counter() - started_at)
+
+    def snapshot(self) -> dict:
+        return {
+            "pool": {
+                "size": self.pool.size(),
+                "checked_in": self.pool.checkedin(),
+                "checked_out": self.pool.checkedout(),
+                "overflow": self.pool.overflow(),
+            },
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "checked_out": self.checked_out.snapshot(),
+            "overflow": self.overflow.snapshot(),
+            "wait_time_seconds": self.wait_time.snapshot(),
+        }
+
+
+class TransactionMetrics:
+    """입출금 결과 카운터, 경합 시 처리량과 409 비율을 비교하는 용도"""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.committed = 0
+        self.conflicts = 0
+        self.rejected = 0
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+
+    def snapshot(self) -> dict:
+        elapsed = time.monotonic() - self.started_at
+        attempts = self.committed + self.conflicts + self.rejected
+        return {
+            "committed": self.committed,
+            "conflicts": self.conflicts,
+            "rejected": self.rejected,
+            "committed_per_second": self.committed / elapsed if elapsed else 0.0,
+            "conflict_rate": self.conflicts / attempts if attempts else 0.0,
+            "batch_size": self.batch_size.snapshot(),
+        }
+
+
+transaction_metrics = TransactionMetrics()
@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 
-from app.api import routers
+from app.api import metrics, routers
 
 app = FastAPI()
 
 app.include_router(routers.router)
+app.include_router(metrics.router)
@@ -1,12 +1,60 @@
-from sqlalchemy import Column, Float, Integer, String
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+)
 
 from app.core.db import Base
 
+# 센트 단위까지 정확하게 저장
+Money = Numeric(18, 2)
+
 
 class Account(Base):
     __tablename__ = "accounts"
 
     id = Column(Integer, primary_key=True, index=True)
     account_name = Column(String, unique=True, index=True)
-    balance = Column(Float)
+    balance = Column(Money)
     version = Column(Integer, default=0)
+
+
+class LedgerEntry(Base):
+    """입출금 기록, 추가만 하고 수정/삭제하지 않는다"""
+
+    __tablename__ = "ledger_entries"
+
+    id = Column(BigInteger, primary_key=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    # 이 거래를 적용한 뒤의 Account.version
+    version = Column(Integer, nullable=False)
+    kind = Column(String(16), nullable=False)
+    amount = Column(Money, nullable=False)
+    created_dt = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index(
+            "ix_ledger_entries_account_id_version",
+            "account_id",
+            "version",
+            unique=True,
+        ),
+    )
+
+
+class BalanceSnapshot(Base):
+    """일정 version마다 남기는 잔액, 과거 잔액은 스냅샷 + 그 뒤의 기록만 더한다"""
+
+    __tablename__ = "balance_snapshots"
+
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
+    version = Column(Integer, primary_key=True)
+    balance = Column(Money, nullable=False)
+    created_dt = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,4 +1,11 @@
-from pydantic import BaseModel
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# 소수점 둘째 자리(센트)까지만 받는다
+Money = Field(max_digits=18, decimal_places=2)
 
 
 class AccountBase(BaseModel):
@@ -6,12 +13,12 @@ class AccountBase(BaseModel):
 
 
 class AccountCreate(AccountBase):
-    balance: float
+    balance: Decimal = Money
 
 
 class AccountDetail(AccountBase):
     id: int
-    balance: float
+    balance: Decimal
     version: int
 
     class Config:
@@ -20,8 +27,56 @@ class AccountDetail(AccountBase):
 
 class Transaction(BaseModel):
     account_name: str
-    amount: float
-    version: int
+    amount: Decimal = Money
+    # optimistic 모드에서만 사용
+    version: Optional[int] = None
 
     class Config:
         orm_mode = True
+
+
+class StatementEntry(BaseModel):
+    version: int
+    kind: str
+    amount: Decimal
+    balance_after: Decimal
+    created_dt: datetime
+
+
+class Statement(AccountBase):
+    balance: Decimal
+    entries: list[StatementEntry]
+    # 다음 페이지 요청에 before로 넘긴다
+    next_cursor: Optional[int] = None
+
+
+class HistoricalBalance(AccountBase):
+    at: datetime
+    balance: Decimal
+
+
+class BatchTransaction(BaseModel):
+    account_name: str
+    type: Literal["deposit", "withdraw"]
+    amount: Decimal = Money
+
+
+class BatchRequest(BaseModel):
+    transactions: list[BatchTransaction]
+    # True면 하나라도 실패할 때 전부 되돌리고, False면 성공한 것만 반영
+    atomic: bool = True
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    account_name: str
+    status_code: int
+    detail: Optional[str] = None
+    balance: Optional[Decimal] = None
+    version: Optional[int] = None
+
+
+class BatchResult(BaseModel):
+    committed: bool
+    applied: int
+    results: list[BatchItemResult]
@@ -1,19 +1,40 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Optional
+
 from fastapi import Depends, HTTPException
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.db import get_db
+from app.core.metrics import transaction_metrics
 from app.models import Account
-from app.schema import AccountCreate, AccountDetail, Transaction
+from app.schema import (
+    AccountCreate,
+    AccountDetail,
+    HistoricalBalance,
+    Statement,
+    Transaction,
+)
+from app.service.ledger_service import balance_at_time, get_statement, record_entry
+from app.service.serializer import account_serializer
 
 
-def get_account_by_name(account_name: str, db: Session = Depends(get_db)):
-    account = db.query(Account).filter(Account.account_name == account_name).first()
-    return account
+async def get_account_by_name(account_name: str, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(
+        select(Account).where(Account.account_name == account_name)
+    )
+    return result.scalars().first()
 
 
 def perform_transaction(account: Account, transaction: Transaction):
+    if transaction.version is None:
+        raise HTTPException(status_code=400, detail="Version is required")
+
     if account.version != transaction.version:
+        transaction_metrics.conflicts += 1
         raise HTTPException(
             status_code=409, detail="Conflict, please refresh and try again"
         )
@@ -24,48 +45,147 @@ def perform_transaction(account: Account, transaction: Transaction):
     return account
 
 
-def create_account(account: AccountCreate, db: Session = Depends(get_db)):
+async def commit_optimistic(db: AsyncSession):
+    # 같은 version으로 동시에 들어온 요청은 (account_id, version) 원장 인덱스에서 걸린다
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        transaction_metrics.conflicts += 1
+        raise HTTPException(
+            status_code=409, detail="Conflict, please refresh and try again"
+        ) from exc
+    transaction_metrics.committed += 1
+
+
+async def apply_atomic(account_name: str, amount: Decimal, db: AsyncSession):
+    # 잔액 계산과 검사를 DB에서 한 문장으로 처리, 동시 요청이 와도 409가 없다
+    result = await db.execute(
+        update(Account)
+        .where(Account.account_name == account_name, Account.balance + amount >= 0)
+        .values(balance=Account.balance + amount, version=Account.version + 1)
+        .returning(Account.id, Account.account_name, Account.balance, Account.version)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    if row is None:
+        await db.rollback()
+        if not await get_account_by_name(account_name, db):
+            raise HTTPException(status_code=404, detail="Account not found")
+        transaction_metrics.rejected += 1
+        raise HTTPException(status_code=400, detail="Insufficient balance")
+
+    record_entry(db, row.id, amount, row.balance, row.version)
+    await db.commit()
+    transaction_metrics.committed += 1
+    return AccountDetail(**row._mapping)
+
+
+async def apply_transaction(account_name: str, amount: Decimal, db: AsyncSession):
+    # 서버에서 잔액을 계산하는 모드, 클라이언트가 보낸 version은 보지 않는다
+    if settings.TRANSACTION_MODE == "serialized":
+        # drain 태스크가 자기 커넥션을 써야 하므로 기다리는 동안 풀 커넥션을 돌려준다
+        await db.close()
+        return await account_serializer.submit(account_name, amount)
+    return await apply_atomic(account_name, amount, db)
+
+
+async def create_account(account: AccountCreate, db: AsyncSession = Depends(get_db)):
     try:
         account = Account(account_name=account.account_name, balance=account.balance)
         db.add(account)
-        db.commit()
-        db.refresh(account)
+        await db.flush()
+        record_entry(db, account.id, account.balance, account.balance, 0, "opening")
+        await db.commit()
+        await db.refresh(account)
         return account
     except IntegrityError as exc:
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Account already exists") from exc
 
 
-def deposit(account_deposit: Transaction, db: Session = Depends(get_db)):
-    account = get_account_by_name(account_deposit.account_name, db)
+async def deposit(account_deposit: Transaction, db: AsyncSession = Depends(get_db)):
+    if settings.TRANSACTION_MODE != "optimistic":
+        if account_deposit.amount <= 0:
+            raise HTTPException(status_code=400, detail="Invalid transaction amount")
+        return await apply_transaction(
+            account_deposit.account_name, account_deposit.amount, db
+        )
+
+    account = await get_account_by_name(account_deposit.account_name, db)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
     account = perform_transaction(account, account_deposit)
     account.balance += account_deposit.amount
     account.version += 1
-    db.commit()
-    db.refresh(account)
+    record_entry(
+        db, account.id, account_deposit.amount, account.balance, account.version
+    )
+    await commit_optimistic(db)
+    await db.refresh(account)
     return account
 
 
-def withdraw(account_withdraw: Transaction, db: Session = Depends(get_db)):
-    account = get_account_by_name(account_withdraw.account_name, db)
+async def withdraw(account_withdraw: Transaction, db: AsyncSession = Depends(get_db)):
+    if settings.TRANSACTION_MODE != "optimistic":
+        if account_withdraw.amount <= 0:
+            raise HTTPException(status_code=400, detail="Invalid transaction amount")
+        return await apply_transaction(
+            account_withdraw.account_name, -account_withdraw.amount, db
+        )
+
+    account = await get_account_by_name(account_withdraw.account_name, db)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
     account = perform_transaction(account, account_withdraw)
     if account.balance < account_withdraw.amount:
+        transaction_metrics.rejected += 1
         raise HTTPException(status_code=400, detail="Insufficient balance")
 
     account.balance -= account_withdraw.amount
     account.version += 1
-    db.commit()
-    db.refresh(account)
+    record_entry(
+        db, account.id, -account_withdraw.amount, account.balance, account.version
+    )
+    await commit_optimistic(db)
+    await db.refresh(account)
     return account
 
 
-def get_account_detail(account: AccountDetail, db: Session = Depends(get_db)):
-    account = get_account_by_name(db, account.account_name)
+async def get_account_detail(
+    account: AccountDetail, db: AsyncSession = Depends(get_db)
+):
+    account = await get_account_by_name(account.account_name, db)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     return account
+
+
+async def get_account_statement(
+    account_name: str, before: Optional[int], limit: int, db: AsyncSession
+):
+    account = await get_account_by_name(account_name, db)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    entries, next_cursor = await get_statement(db, account.id, before, limit)
+    return Statement(
+        account_name=account.account_name,
+        balance=account.balance,
+        entries=entries,
+        next_cursor=next_cursor,
+    )
+
+
+async def get_historical_balance(account_name: str, at: datetime, db: AsyncSession):
+    account = await get_account_by_name(account_name, db)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    # 기록은 naive UTC로 저장되므로 시간대가 붙은 값은 UTC로 바꿔 비교
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    balance = await balance_at_time(db, account.id, at)
+    return HistoricalBalance(account_name=account.account_name, at=at, balance=balance)
@@ -0,0 +1,96 @@
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import transaction_metrics
+from app.models import Account
+from app.schema import BatchItemResult, BatchRequest, BatchResult
+from app.service.ledger_service import record_entry
+
+
+async def apply_batch(batch: BatchRequest, db: AsyncSession) -> BatchResult:
+    if not batch.transactions:
+        raise HTTPException(status_code=400, detail="No transactions")
+    if len(batch.transactions) > settings.BATCH_MAX_TRANSACTIONS:
+        raise HTTPException(status_code=400, detail="Too many transactions")
+
+    # 계좌는 IN 한 번으로 찾고, 데드락이 나지 않도록 항상 id 순서로 잠근다
+    names = sorted({item.account_name for item in batch.transactions})
+    result = await db.execute(
+        select(Account)
+        .where(Account.account_name.in_(names))
+        .order_by(Account.id)
+        .with_for_update()
+    )
+    accounts = {account.account_name: account for account in result.scalars()}
+
+    results = []
+    applied = 0
+    for index, item in enumerate(batch.transactions):
+        account = accounts.get(item.account_name)
+        if account is None:
+            results.append(
+                BatchItemResult(
+                    index=index,
+                    account_name=item.account_name,
+                    status_code=404,
+                    detail="Account not found",
+                )
+            )
+            continue
+
+        amount = item.amount if item.type == "deposit" else -item.amount
+        if item.amount <= 0:
+            detail = "Invalid transaction amount"
+        elif account.balance + amount < 0:
+            detail = "Insufficient balance"
+        else:
+            detail = None
+        if detail:
+            results.append(
+                BatchItemResult(
+                    index=index,
+                    account_name=item.account_name,
+                    status_code=400,
+                    detail=detail,
+                )
+            )
+            continue
+
+        # 같은 계좌의 여러 거래는 메모리에서 누적하고 flush 때 UPDATE 한 번
+        account.balance += amount
+        account.version += 1
+        record_entry(db, account.id, amount, account.balance, account.version)
+        applied += 1
+        results.append(
+            BatchItemResult(
+                index=index,
+                account_name=item.account_name,
+                status_code=200,
+                balance=account.balance,
+                version=account.version,
+            )
+        )
+
+    failed = len(results) - applied
+    if batch.atomic and failed:
+        await db.rollback()
+        transaction_metrics.rejected += failed
+        # 성공했던 항목도 함께 되돌렸음을 표시
+        for item_result in results:
+            if item_result.status_code == 200:
+                item_result.status_code = 424
+                item_result.detail = "Rolled back, another transaction failed"
+                item_result.balance = item_result.version = None
+        raise HTTPException(
+            status_code=400,
+            detail=BatchResult(committed=False, applied=0, results=results).model_dump(
+                mode="json"
+            ),
+        )
+
+    await db.commit()
+    transaction_metrics.committed += applied
+    transaction_metrics.rejected += failed
+    return BatchResult(committed=True, applied=applied, results=results)
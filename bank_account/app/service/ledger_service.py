@@ -0,0 +1,107 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import BalanceSnapshot, LedgerEntry
+from app.schema import StatementEntry
+
+
+def record_entry(
+    db: AsyncSession,
+    account_id: int,
+    amount: Decimal,
+    balance: Decimal,
+    version: int,
+    kind: Optional[str] = None,
+):
+    # 잔액 변경과 같은 트랜잭션에서 기록, commit은 호출한 쪽에서
+    kind = kind or ("deposit" if amount > 0 else "withdraw")
+    db.add(
+        LedgerEntry(account_id=account_id, version=version, kind=kind, amount=amount)
+    )
+    if version and version % settings.LEDGER_SNAPSHOT_EVERY == 0:
+        db.add(BalanceSnapshot(account_id=account_id, version=version, balance=balance))
+
+
+async def _balance_from_snapshot(
+    db: AsyncSession, account_id: int, snapshot_filter, entry_filter
+) -> Decimal:
+    # 가장 가까운 스냅샷 이후의 기록만 더하므로 최대 LEDGER_SNAPSHOT_EVERY 행만 읽는다
+    snapshot = (
+        await db.execute(
+            select(BalanceSnapshot.version, BalanceSnapshot.balance)
+            .where(BalanceSnapshot.account_id == account_id, snapshot_filter)
+            .order_by(BalanceSnapshot.version.desc())
+            .limit(1)
+        )
+    ).first()
+    base_version, base_balance = snapshot if snapshot else (-1, Decimal("0"))
+
+    delta = await db.scalar(
+        select(func.coalesce(func.sum(LedgerEntry.amount), 0)).where(
+            LedgerEntry.account_id == account_id,
+            LedgerEntry.version > base_version,
+            entry_filter,
+        )
+    )
+    return base_balance + Decimal(delta)
+
+
+async def balance_at_version(
+    db: AsyncSession, account_id: int, version: int
+) -> Decimal:
+    return await _balance_from_snapshot(
+        db,
+        account_id,
+        BalanceSnapshot.version <= version,
+        LedgerEntry.version <= version,
+    )
+
+
+async def balance_at_time(db: AsyncSession, account_id: int, at: datetime) -> Decimal:
+    return await _balance_from_snapshot(
+        db,
+        account_id,
+        BalanceSnapshot.created_dt <= at,
+        LedgerEntry.created_dt <= at,
+    )
+
+
+async def get_statement(
+    db: AsyncSession, account_id: int, before: Optional[int], limit: int
+) -> tuple[list[StatementEntry], Optional[int]]:
+    # (account_id, version) 인덱스를 따라 최신 기록부터 keyset 페이지네이션
+    query = select(LedgerEntry).where(LedgerEntry.account_id == account_id)
+    if before is not None:
+        query = query.where(LedgerEntry.version < before)
+    result = await db.execute(
+        query.order_by(LedgerEntry.version.desc()).limit(limit + 1)
+    )
+    entries = result.scalars().all()
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = entries[-1].version
+    if not entries:
+        return [], None
+
+    # 첫 행의 잔액만 계산하고 나머지는 거꾸로 빼 나간다
+    balance = await balance_at_version(db, account_id, entries[0].version)
+    statement = []
+    for entry in entries:
+        statement.append(
+            StatementEntry(
+                version=entry.version,
+                kind=entry.kind,
+                amount=entry.amount,
+                balance_after=balance,
+                created_dt=entry.created_dt,
+            )
+        )
+        balance -= entry.amount
+    return statement, next_cursor
@@ -0,0 +1,124 @@
+import asyncio
+from dataclasses import dataclass
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.metrics import transaction_metrics
+from app.models import Account
+from app.schema import AccountDetail
+from app.service.ledger_service import record_entry
+
+
+@dataclass
+class PendingTransaction:
+    amount: Decimal
+    future: asyncio.Future
+
+
+class AccountSerializer:
+    """계좌별 대기열, 동시에 들어온 거래를 모아 한 트랜잭션에서 순서대로 적용
+
+    계좌마다 drain 태스크가 하나만 돌기 때문에 같은 프로세스 안에서는
+    충돌이 나지 않고, 다른 프로세스와는 SELECT ... FOR UPDATE로 직렬화된다.
+    """
+
+    def __init__(self, max_batch: int):
+        self.max_batch = max_batch
+        self._queues: dict[str, list[PendingTransaction]] = {}
+        self._drainers: dict[str, asyncio.Task] = {}
+
+    async def submit(self, account_name: str, amount: Decimal) -> AccountDetail:
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(account_name, []).append(
+            PendingTransaction(amount, future)
+        )
+        if account_name not in self._drainers:
+            self._drainers[account_name] = asyncio.create_task(
+                self._drain(account_name)
+            )
+        return await future
+
+    async def _drain(self, account_name: str):
+        try:
+            while queue := self._queues.get(account_name):
+                batch = queue[: self.max_batch]
+                del queue[: self.max_batch]
+                # 기다리다 취소된 요청은 적용하지 않는다
+                batch = [pending for pending in batch if not pending.future.done()]
+                if batch:
+                    await self._apply(account_name, batch)
+        finally:
+            for pending in self._queues.pop(account_name, []):
+                if not pending.future.done():
+                    pending.future.cancel()
+            self._drainers.pop(account_name, None)
+
+    async def _apply(self, account_name: str, batch: list[PendingTransaction]):
+        results = []
+        try:
+            async with SessionLocal() as db:
+                account = await db.scalar(
+                    select(Account)
+                    .where(Account.account_name == account_name)
+                    .with_for_update()
+                )
+                if account is None:
+                    for pending in batch:
+                        _resolve(
+                            pending,
+                            HTTPException(status_code=404, detail="Account not found"),
+                        )
+                    return
+
+                balance, version = account.balance, account.version
+                for pending in batch:
+                    if balance + pending.amount < 0:
+                        results.append(
+                            HTTPException(
+                                status_code=400, detail="Insufficient balance"
+                            )
+                        )
+                        continue
+                    balance += pending.amount
+                    version += 1
+                    record_entry(db, account.id, pending.amount, balance, version)
+                    results.append(
+                        AccountDetail(
+                            id=account.id,
+                            account_name=account.account_name,
+                            balance=balance,
+                            version=version,
+                        )
+                    )
+
+                account.balance = balance
+                account.version = version
+                await db.commit()
+        except Exception as exc:
+            for pending in batch:
+                _resolve(pending, exc)
+            return
+
+        transaction_metrics.batch_size.observe(len(batch))
+        for pending, result in zip(batch, results):
+            if isinstance(result, HTTPException):
+                transaction_metrics.rejected += 1
+            else:
+                transaction_metrics.committed += 1
+            _resolve(pending, result)
+
+
+def _resolve(pending: PendingTransaction, result):
+    if pending.future.done():
+        return
+    if isinstance(result, Exception):
+        pending.future.set_exception(result)
+    else:
+        pending.future.set_result(result)
+
+
+account_serializer = AccountSerializer(settings.TRANSACTION_BATCH_MAX)
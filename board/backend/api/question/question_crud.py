@@ -1,22 +1,170 @@
+import base64
+import os
+import time
 from datetime import datetime
+from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session, aliased, joinedload, noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import text
 
 import schema
-from models import Question
+from models import Answer, Question
+
+# total 캐시 유지 시간(초)
+QUESTION_TOTAL_TTL = int(os.getenv("QUESTION_TOTAL_TTL", "30"))
+# 통계상 행 수가 이 값을 넘으면 COUNT 대신 추정치를 사용
+QUESTION_COUNT_EXACT_LIMIT = int(os.getenv("QUESTION_COUNT_EXACT_LIMIT", "100000"))
+
+# 목록 화면의 answers 로딩 전략 (selectin / joined)
+QUESTION_LIST_LOADER = os.getenv("QUESTION_LIST_LOADER", "selectin")
+# 목록 화면에서 질문당 포함할 최대 답변 수 (0이면 제한 없음)
+ANSWER_EMBED_LIMIT = int(os.getenv("ANSWER_EMBED_LIMIT", "0"))
+
+_total_cache = {"value": None, "expires_at": 0.0}
+
+
+def answer_loader(strategy: str):
+    if strategy == "joined":
+        return joinedload(Question.answers)
+    if strategy == "selectin":
+        return selectinload(Question.answers)
+    if strategy == "capped":
+        # load_capped_answers()가 한 번의 쿼리로 채운다
+        return noload(Question.answers)
+    raise ValueError(f"Unknown loader strategy: {strategy}")
+
+
+def list_loader_strategy() -> str:
+    return "capped" if ANSWER_EMBED_LIMIT > 0 else QUESTION_LIST_LOADER
+
+
+def load_capped_answers(db: Session, question_list: list[Question], cap: int):
+    if not question_list:
+        return
+
+    ranked = (
+        select(
+            Answer,
+            func.row_number()
+            .over(
+                partition_by=Answer.question_id,
+                order_by=(Answer.create_date.desc(), Answer.id.desc()),
+            )
+            .label("rn"),
+            func.count().over(partition_by=Answer.question_id).label("answer_count"),
+        )
+        .where(Answer.question_id.in_([question.id for question in question_list]))
+        .subquery()
+    )
+    ranked_answer = aliased(Answer, ranked)
+    rows = db.execute(
+        select(ranked_answer, ranked.c.answer_count)
+        .where(ranked.c.rn <= cap)
+        .order_by(ranked.c.question_id, ranked.c.rn)
+    ).all()
+
+    answers = {question.id: [] for question in question_list}
+    counts = {}
+    for answer, answer_count in rows:
+        answers[answer.question_id].append(answer)
+        counts[answer.question_id] = answer_count
+
+    for question in question_list:
+        set_committed_value(question, "answers", answers[question.id])
+        question.answer_count = counts.get(question.id, 0)
+
+
+def apply_list_loader(db: Session, question_list: list[Question], strategy: str):
+    if strategy == "capped":
+        load_capped_answers(db, question_list, ANSWER_EMBED_LIMIT)
+
+
+def encode_cursor(question: Question) -> str:
+    raw = f"{question.create_date.isoformat()}|{question.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        create_date, question_id = raw.split("|")
+        return datetime.fromisoformat(create_date), int(question_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def get_question_total(db: Session) -> int:
+    now = time.monotonic()
+    if _total_cache["value"] is not None and _total_cache["expires_at"] > now:
+        return _total_cache["value"]
+
+    # 큰 테이블은 pg_class 통계로 추정하고, 작은 테이블만 정확히 센다
+    estimate = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'question'")
+    ).scalar()
+    if estimate is not None and estimate > QUESTION_COUNT_EXACT_LIMIT:
+        total = estimate
+    else:
+        total = db.query(func.count(Question.id)).scalar()
+
+    _total_cache["value"] = total
+    _total_cache["expires_at"] = now + QUESTION_TOTAL_TTL
+    return total
 
 
 def get_question_list(db: Session, skip: int = 0, limit: int = 10):
-    _question_list = db.query(Question).order_by(Question.create_date.desc())
+    strategy = list_loader_strategy()
+    _question_list = (
+        db.query(Question)
+        .options(answer_loader(strategy))
+        .order_by(Question.create_date.desc(), Question.id.desc())
+    )
 
-    total = _question_list.count()
+    total = get_question_total(db)
     question_list = _question_list.offset(skip).limit(limit).all()
+    apply_list_loader(db, question_list, strategy)
     return total, question_list
 
 
-def get_question(db: Session, question_id: int):
-    question = db.query(Question).get(question_id)
+def get_question_list_by_cursor(
+    db: Session, cursor: Optional[str] = None, limit: int = 10
+):
+    strategy = list_loader_strategy()
+    _question_list = db.query(Question).options(answer_loader(strategy))
+
+    if cursor:
+        create_date, question_id = decode_cursor(cursor)
+        _question_list = _question_list.filter(
+            or_(
+                Question.create_date < create_date,
+                and_(Question.create_date == create_date, Question.id < question_id),
+            )
+        )
+
+    # 한 건 더 읽어서 다음 페이지 존재 여부를 판단
+    question_list = (
+        _question_list.order_by(Question.create_date.desc(), Question.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(question_list) > limit:
+        question_list = question_list[:limit]
+        next_cursor = encode_cursor(question_list[-1])
+
+    apply_list_loader(db, question_list, strategy)
+    total = get_question_total(db)
+    return total, question_list, next_cursor
+
+
+def get_question(db: Session, question_id: int, strategy: Optional[str] = None):
+    _question = db.query(Question)
+    if strategy:
+        _question = _question.options(answer_loader(strategy))
+    question = _question.filter(Question.id == question_id).first()
     return question
 
 
@@ -29,6 +177,9 @@ def create_question(db: Session, question_create: schema.QuestionCreate):
     db.add(db_question)
     db.commit()
 
+    if _total_cache["value"] is not None:
+        _total_cache["value"] += 1
+
 
 # def get_question_list(db: Session, skip: int = 0, limit: int = 10):
 #     sql_query = """
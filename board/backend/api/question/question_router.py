@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import text
 from starlette import status
@@ -13,7 +15,26 @@ router = APIRouter(prefix="/api/question")
 
 
 @router.get("/list", response_model=schema.QuestionList)
-def question_list(db: Session = Depends(get_db), page: int = 0, size: int = 10):
+def question_list(
+    db: Session = Depends(get_db),
+    page: int = 0,
+    size: int = 10,
+    cursor: Optional[str] = None,
+):
+    # cursor 파라미터가 있으면 (빈 값 포함) 커서 모드로 동작
+    if cursor is not None:
+        try:
+            total, _question_list, next_cursor = (
+                question_crud.get_question_list_by_cursor(db, cursor=cursor, limit=size)
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {
+            "total": total,
+            "question_list": _question_list,
+            "next_cursor": next_cursor,
+        }
+
     total, _question_list = question_crud.get_question_list(
         db, skip=page * size, limit=size
     )
@@ -22,7 +43,9 @@ def question_list(db: Session = Depends(get_db), page: int = 0, size: int = 10):
 
 @router.get("/detail/{question_id}", response_model=schema.Question)
 def question_detail(question_id: int, db: Session = Depends(get_db)):
-    question = question_crud.get_question(db, question_id=question_id)
+    question = question_crud.get_question(
+        db, question_id=question_id, strategy="joined"
+    )
     return question
 
 
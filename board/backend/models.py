@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -14,6 +14,9 @@ class Question(Base):
 
     answers = relationship("Answer", back_populates="question")
 
+    # 커서 페이지네이션 (create_date, id) 정렬용 복합 인덱스
+    __table_args__ = (Index("ix_question_create_date_id", "create_date", "id"),)
+
 
 class Answer(Base):
     __tablename__ = "answer"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, field_validator
 
@@ -37,6 +37,8 @@ class Question(BaseModel):
     content: str
     create_date: datetime
     answers: List[Answer] = []
+    # 목록에서 답변 수를 제한한 경우 전체 답변 수
+    answer_count: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -45,3 +47,4 @@ class Question(BaseModel):
 class QuestionList(BaseModel):
     total: int = 0
     question_list: List[Question] = []
+    next_cursor: Optional[str] = None
@@ -24,7 +24,7 @@ def login(user_login: UserLogin, response: Response, db: Session = Depends(get_d
     user = authenticate_user(username, password, db)
     if not user:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
-    session = create_session(user.user_id, db)
+    session = create_session(user, db)
     response.set_cookie(
         key="session_id", value=session.session_id, httponly=False
     )  # 쿠키 설정
@@ -1,9 +1,26 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from api import auth, some_resource, user_router
+from services.session_store import session_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweeper = asyncio.create_task(session_store.run_sweeper())
+
+    yield
+
+    sweeper.cancel()
+    await asyncio.gather(sweeper, return_exceptions=True)
+    # 슬라이딩 연장된 만료 시간을 DB에 반영
+    await asyncio.to_thread(session_store.sweep)
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 origins = ["http://localhost:5173"]
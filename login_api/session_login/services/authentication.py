@@ -1,20 +1,29 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from database import get_db
 from model import Sessions, User
+from schema import UserOut
 
-from .hashing import verify_password
+from .hashing import verify_and_update_password
+from .session_store import session_store
 
 
-def create_session(user_id: int, db: Session = Depends(get_db)) -> Session:
-    expire_time = datetime.now() + timedelta(days=1)
-    new_session = Sessions(user_id=user_id, expire_time=expire_time)
+def create_session(user: User, db: Session = Depends(get_db)) -> Sessions:
+    expire_time = datetime.now() + session_store.ttl
+    new_session = Sessions(user_id=user.user_id, expire_time=expire_time)
     db.add(new_session)
     db.commit()
     db.refresh(new_session)
+
+    # write-through
+    session_store.put(
+        new_session.session_id,
+        UserOut(user_id=user.user_id, username=user.username, email=user.email),
+        expire_time,
+    )
     return new_session
 
 
@@ -22,28 +31,62 @@ def authenticate_user(
     username: str, password: str, db: Session = Depends(get_db)
 ) -> User:
     user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.password_hash):
+    verified, new_hash = (
+        verify_and_update_password(password, user.password_hash)
+        if user
+        else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # rounds 설정이 바뀌었으면 새 해시로 교체
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
     return user
 
 
 def delete_session(session_id: str, db: Session = Depends(get_db)):
+    session_store.pop(session_id)
     db.query(Sessions).filter(Sessions.session_id == session_id).delete()
     db.commit()
 
 
-def get_user_by_session(session_id: str, db: Session = Depends(get_db)) -> User:
-    session = db.query(Sessions).filter(Sessions.session_id == session_id).first()
-    if not session or session.expire_time < datetime.now():
-        if session:
-            delete_session(session)
+def get_user_by_session(session_id: str, db: Session = Depends(get_db)) -> UserOut:
+    cached = session_store.get(session_id)
+    if cached and not session_store.needs_recheck(cached):
+        return cached.user
+
+    # 메모리에 없거나 (재시작 등) 확인한 지 오래됐으면 DB에서 읽는다,
+    # 다른 워커에서 로그아웃해 행이 지워졌으면 여기서 거절된다
+    row = (
+        db.query(Sessions.expire_time, User.user_id, User.username, User.email)
+        .join(User, Sessions.user_id == User.user_id)
+        .filter(Sessions.session_id == session_id)
+        .first()
+    )
+    # 연장된 만료 시간은 sweeper가 반영하기 전까지 메모리에만 있다
+    expire_time = row.expire_time if row else None
+    if row and cached:
+        expire_time = max(expire_time, cached.expire_time)
+
+    if not row or expire_time < datetime.now():
+        if row:
+            delete_session(session_id, db)
+        else:
+            session_store.pop(session_id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Session expired or not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return session.user
+
+    user = UserOut(user_id=row.user_id, username=row.username, email=row.email)
+    session_store.put(session_id, user, expire_time)
+    # 조회 시점부터 슬라이딩 연장
+    session_store.get(session_id)
+    return user
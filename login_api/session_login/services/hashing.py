@@ -1,9 +1,49 @@
-from passlib.hash import pbkdf2_sha256
+import os
+import threading
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+load_dotenv()
+
+PBKDF2_ROUNDS = int(os.getenv("PBKDF2_ROUNDS", "29000"))
+PASSWORD_HASH_MAX_CONCURRENT = int(os.getenv("PASSWORD_HASH_MAX_CONCURRENT", "8"))
+
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    pbkdf2_sha256__default_rounds=PBKDF2_ROUNDS,
+    pbkdf2_sha256__min_rounds=PBKDF2_ROUNDS,
+    pbkdf2_sha256__max_rounds=PBKDF2_ROUNDS,
+)
+
+# 라우트가 sync라 요청 스레드에서 바로 해시한다, 스레드풀을 다 차지하지 않도록 동시 실행 수만 제한
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_MAX_CONCURRENT)
+
+
+def _limited(fn, *args):
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        return fn(*args)
+    finally:
+        _slots.release()
 
 
 def hash_password(password: str) -> str:
-    return pbkdf2_sha256.hash(password)
+    return _limited(pwd_context.hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pbkdf2_sha256.verify(plain_password, hashed_password)
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    return _limited(pwd_context.verify_and_update, plain_password, hashed_password)
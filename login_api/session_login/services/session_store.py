@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, delete, select, update
+
+from database import SessionLocal
+from model import Sessions
+from schema import UserOut
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "86400"))
+SESSION_SWEEP_INTERVAL = int(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+SESSION_SWEEP_BATCH = int(os.getenv("SESSION_SWEEP_BATCH", "1000"))
+# 다른 워커의 로그아웃을 반영하기 위해 캐시된 세션을 DB에서 다시 확인하는 주기, 0이면 매 요청
+SESSION_RECHECK_SECONDS = int(os.getenv("SESSION_RECHECK_SECONDS", "5"))
+
+
+@dataclass
+class CachedSession:
+    session_id: str
+    user: UserOut
+    expire_time: datetime
+    # DB에서 세션 행을 마지막으로 확인한 시각
+    checked_at: datetime
+    # 연장된 만료 시간이 아직 DB에 반영되지 않았는지
+    dirty: bool = False
+
+
+class SessionStore:
+    """sessions 테이블 앞단의 메모리 세션 저장소 (슬라이딩 만료)"""
+
+    def __init__(self, ttl: timedelta, recheck: timedelta):
+        self.ttl = ttl
+        self.recheck = recheck
+        self._sessions: dict[str, CachedSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[CachedSession]:
+        now = datetime.now()
+        with self._lock:
+            cached = self._sessions.get(session_id)
+            if cached is None:
+                return None
+            if cached.expire_time < now:
+                del self._sessions[session_id]
+                return None
+
+            # 접근할 때마다 만료 시간 연장, DB 반영은 sweeper가 모아서 처리
+            cached.expire_time = now + self.ttl
+            cached.dirty = True
+            return cached
+
+    def put(self, session_id: str, user: UserOut, expire_time: datetime):
+        with self._lock:
+            self._sessions[session_id] = CachedSession(
+                session_id, user, expire_time, datetime.now()
+            )
+
+    def needs_recheck(self, cached: CachedSession) -> bool:
+        return datetime.now() - cached.checked_at >= self.recheck
+
+    def pop(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def take_renewals(self) -> list[dict]:
+        with self._lock:
+            renewals = []
+            for cached in self._sessions.values():
+                if cached.dirty:
+                    cached.dirty = False
+                    renewals.append(
+                        {
+                            "b_session_id": cached.session_id,
+                            "b_expire_time": cached.expire_time,
+                        }
+                    )
+            return renewals
+
+    def evict_expired(self) -> int:
+        now = datetime.now()
+        with self._lock:
+            expired = [
+                session_id
+                for session_id, cached in self._sessions.items()
+                if cached.expire_time < now
+            ]
+            for session_id in expired:
+                del self._sessions[session_id]
+        return len(expired)
+
+    def sweep(self, batch_size: int = SESSION_SWEEP_BATCH) -> int:
+        self.evict_expired()
+
+        db = SessionLocal()
+        try:
+            renewals = self.take_renewals()
+            for start in range(0, len(renewals), batch_size):
+                db.connection().execute(
+                    update(Sessions)
+                    .where(Sessions.session_id == bindparam("b_session_id"))
+                    .values(expire_time=bindparam("b_expire_time")),
+                    renewals[start : start + batch_size],
+                )
+                db.commit()
+
+            # 만료된 행을 batch 단위로 삭제
+            purged = 0
+            while True:
+                expired = (
+                    select(Sessions.session_id)
+                    .where(Sessions.expire_time < datetime.now())
+                    .limit(batch_size)
+                    .scalar_subquery()
+                )
+                result = db.execute(
+                    delete(Sessions)
+                    .where(Sessions.session_id.in_(expired))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                purged += result.rowcount
+                if result.rowcount < batch_size:
+                    return purged
+        finally:
+            db.close()
+
+    async def run_sweeper(self, interval: int = SESSION_SWEEP_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                purged = await asyncio.to_thread(self.sweep)
+                if purged:
+                    logger.info("purged %d expired sessions", purged)
+            except Exception:
+                logger.exception("session sweep failed")
+
+
+session_store = SessionStore(
+    timedelta(seconds=SESSION_TTL_SECONDS), timedelta(seconds=SESSION_RECHECK_SECONDS)
+)
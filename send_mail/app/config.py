@@ -15,5 +15,24 @@ class Settings(BaseSettings):
     USE_CREDENTIALS: bool
     TEMPLATE_FOLDER: str
 
+    # 발송 대기열과 SMTP 워커
+    MAIL_OUTBOX_PATH: str = "./outbox.sqlite3"
+    MAIL_WORKERS: int = 2
+    MAIL_BATCH_SIZE: int = 50
+    MAIL_MAX_ATTEMPTS: int = 6
+    MAIL_RETRY_BACKOFF: float = 30
+    MAIL_POLL_INTERVAL: float = 5
+    MAIL_IDLE_TIMEOUT: float = 60
+    MAIL_TIMEOUT: float = 30
+    # 'sending' 상태로 이보다 오래 남은 delivery는 버려진 것으로 보고 다시 보낸다
+    # 배치 하나를 보내는 시간(MAIL_BATCH_SIZE * MAIL_TIMEOUT)보다 길어야 한다
+    MAIL_STALE_TIMEOUT: float = 1800
+    MAIL_REQUEUE_INTERVAL: float = 60
+
+    # 템플릿 캐시와 대량 렌더링 (워커 0이면 CPU 수만큼)
+    TEMPLATE_CACHE_SIZE: int = 400
+    TEMPLATE_RENDER_WORKERS: int = 0
+    TEMPLATE_RENDER_CHUNK: int = 500
+
 
 settings = Settings()
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from typing import Optional
+
+import aiosmtplib
+
+from app.config import settings
+from app.email.outbox import Delivery, Outbox, outbox
+
+logger = logging.getLogger(__name__)
+
+
+def build_message(delivery: Delivery) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+    message["To"] = ", ".join(delivery.to_header)
+    message["Subject"] = delivery.subject
+    # 도메인별로 나눠 보내도 같은 메시지로 보이도록 message_id 기준
+    message["Message-ID"] = make_msgid(idstring=delivery.message_id)
+    message.set_content(delivery.body, subtype=delivery.subtype)
+    return message
+
+
+class SMTPConnection:
+    """워커 하나가 재사용하는 SMTP 연결, 끊기거나 오래 놀면 다시 연결"""
+
+    def __init__(self):
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._last_used = 0.0
+
+    @property
+    def idle(self) -> bool:
+        return time.monotonic() - self._last_used > settings.MAIL_IDLE_TIMEOUT
+
+    async def get(self) -> aiosmtplib.SMTP:
+        if self._smtp is not None and self._smtp.is_connected and not self.idle:
+            self._last_used = time.monotonic()
+            return self._smtp
+
+        await self.close()
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            use_tls=settings.MAIL_USE_SSL,
+            start_tls=settings.MAIL_USE_TLS,
+            timeout=settings.MAIL_TIMEOUT,
+        )
+        await smtp.connect()
+        if settings.USE_CREDENTIALS:
+            await smtp.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+
+        self._smtp = smtp
+        self._last_used = time.monotonic()
+        return smtp
+
+    async def close(self):
+        if self._smtp is None:
+            return
+        smtp, self._smtp = self._smtp, None
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+
+class DeliveryPool:
+    """대기열에서 같은 도메인 delivery를 묶어 가져와 연결 하나로 연속 발송"""
+
+    def __init__(self, outbox: Outbox, workers: int):
+        self.outbox = outbox
+        self.workers = workers
+        self._wakeup = asyncio.Event()
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def _deliver(self, connection: SMTPConnection, delivery: Delivery):
+        try:
+            smtp = await connection.get()
+            errors, _ = await smtp.send_message(
+                build_message(delivery), recipients=delivery.recipients
+            )
+        except aiosmtplib.SMTPRecipientsRefused as exc:
+            # 모든 수신자가 거절됨, 5xx면 재시도하지 않는다
+            permanent = all(error.code >= 500 for error in exc.recipients)
+            await asyncio.to_thread(
+                self.outbox.mark_failed,
+                delivery,
+                str(exc),
+                settings.MAIL_MAX_ATTEMPTS,
+                settings.MAIL_RETRY_BACKOFF,
+                permanent,
+            )
+            return
+        except aiosmtplib.SMTPResponseException as exc:
+            await connection.close()
+            await asyncio.to_thread(
+                self.outbox.mark_failed,
+                delivery,
+                str(exc),
+                settings.MAIL_MAX_ATTEMPTS,
+                settings.MAIL_RETRY_BACKOFF,
+                exc.code >= 500,
+            )
+            return
+        except (aiosmtplib.SMTPException, OSError) as exc:
+            # 연결 문제는 다시 연결해서 재시도
+            await connection.close()
+            await asyncio.to_thread(
+                self.outbox.mark_failed,
+                delivery,
+                repr(exc),
+                settings.MAIL_MAX_ATTEMPTS,
+                settings.MAIL_RETRY_BACKOFF,
+            )
+            return
+        except Exception as exc:
+            # 헤더에 개행이 들어간 경우처럼 다시 보내도 실패할 delivery
+            logger.exception("failed to deliver %s", delivery.message_id)
+            await connection.close()
+            await asyncio.to_thread(
+                self.outbox.mark_failed,
+                delivery,
+                repr(exc),
+                settings.MAIL_MAX_ATTEMPTS,
+                settings.MAIL_RETRY_BACKOFF,
+                True,
+            )
+            return
+
+        refused = "; ".join(f"{rcpt}: {resp}" for rcpt, resp in errors.items())
+        await asyncio.to_thread(self.outbox.mark_sent, delivery.id, refused or None)
+
+    async def _worker(self):
+        connection = SMTPConnection()
+        try:
+            while True:
+                try:
+                    batch = await asyncio.to_thread(
+                        self.outbox.claim_batch, settings.MAIL_BATCH_SIZE
+                    )
+                except Exception:
+                    logger.exception("failed to claim mail batch")
+                    batch = []
+
+                for delivery in batch:
+                    try:
+                        await self._deliver(connection, delivery)
+                    except Exception:
+                        # 상태를 못 남긴 delivery는 requeue_stale이 되돌린다
+                        logger.exception("failed to record delivery %d", delivery.id)
+                if batch:
+                    continue
+
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=settings.MAIL_POLL_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    if connection.idle:
+                        await connection.close()
+                self._wakeup.clear()
+        finally:
+            await connection.close()
+
+    async def _requeue_stale(self):
+        # 발송 중에 죽은 워커나 프로세스가 남긴 delivery를 주기적으로 대기열로 되돌린다
+        while True:
+            try:
+                requeued = await asyncio.to_thread(
+                    self.outbox.requeue_stale, settings.MAIL_STALE_TIMEOUT
+                )
+                if requeued:
+                    logger.info("requeued %d interrupted deliveries", requeued)
+                    self.notify()
+            except Exception:
+                logger.exception("failed to requeue stale deliveries")
+            await asyncio.sleep(settings.MAIL_REQUEUE_INTERVAL)
+
+    async def run(self):
+        await asyncio.gather(
+            self._requeue_stale(), *(self._worker() for _ in range(self.workers))
+        )
+
+
+delivery_pool = DeliveryPool(outbox, settings.MAIL_WORKERS)
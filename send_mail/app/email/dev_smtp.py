@@ -0,0 +1,51 @@
+"""테스트/로컬 개발용 SMTP 서버
+
+    python -m app.email.dev_smtp --port 8025
+
+MAIL_SERVER=localhost, MAIL_PORT=8025, MAIL_USE_TLS=false,
+MAIL_USE_SSL=false, USE_CREDENTIALS=false 로 두고 사용한다.
+"""
+
+import argparse
+import time
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import Envelope, Session, SMTP
+
+
+class CapturingHandler:
+    """받은 메일을 실제로 보내지 않고 메모리에 쌓아 둔다"""
+
+    def __init__(self, verbose: bool = False):
+        self.envelopes: list[Envelope] = []
+        self.verbose = verbose
+
+    async def handle_DATA(self, server: SMTP, session: Session, envelope: Envelope):
+        self.envelopes.append(envelope)
+        if self.verbose:
+            print(f"{envelope.mail_from} -> {', '.join(envelope.rcpt_tos)}")
+        return "250 Message accepted for delivery"
+
+
+def start_dev_server(
+    host: str = "127.0.0.1", port: int = 8025, verbose: bool = False
+) -> tuple[Controller, CapturingHandler]:
+    handler = CapturingHandler(verbose)
+    controller = Controller(handler, hostname=host, port=port)
+    controller.start()
+    return controller, handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    controller, _ = start_dev_server(args.host, args.port, verbose=True)
+    print(f"dev SMTP server listening on {args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        controller.stop()
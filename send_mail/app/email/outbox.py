@@ -0,0 +1,227 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import settings
+
+
+@dataclass
+class Delivery:
+    id: int
+    message_id: str
+    domain: str
+    recipients: list[str]
+    to_header: list[str]
+    subject: str
+    body: str
+    subtype: str
+    attempts: int
+
+
+class Outbox:
+    """메일 발송 대기열, 재시작해도 잃지 않도록 SQLite에 저장
+
+    메시지 하나를 수신 도메인별 delivery 행으로 나눠 저장하고
+    워커는 같은 도메인의 delivery를 묶어서 가져간다.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                recipients TEXT NOT NULL,
+                to_header TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                subtype TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                claimed_at REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_outbox_status_next_attempt_at
+                ON outbox (status, next_attempt_at);
+            CREATE INDEX IF NOT EXISTS ix_outbox_message_id ON outbox (message_id);
+            """)
+        self._lock = threading.Lock()
+
+    def enqueue_many(self, messages: list[dict]) -> list[str]:
+        """messages: recipients, subject, body, subtype 를 가진 dict 목록"""
+        now = time.time()
+        rows = []
+        message_ids = []
+        for message in messages:
+            message_id = uuid.uuid4().hex
+            message_ids.append(message_id)
+
+            by_domain: dict[str, list[str]] = {}
+            for recipient in message["recipients"]:
+                domain = recipient.rsplit("@", 1)[-1].lower()
+                by_domain.setdefault(domain, []).append(recipient)
+
+            for domain, recipients in by_domain.items():
+                rows.append(
+                    (
+                        message_id,
+                        domain,
+                        json.dumps(recipients),
+                        json.dumps(message["recipients"]),
+                        message["subject"],
+                        message["body"],
+                        message.get("subtype", "html"),
+                        now,
+                        now,
+                    )
+                )
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT INTO outbox (message_id, domain, recipients, to_header, "
+                    "subject, body, subtype, next_attempt_at, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return message_ids
+
+    def enqueue(self, message: dict) -> str:
+        return self.enqueue_many([message])[0]
+
+    def claim_batch(self, limit: int) -> list[Delivery]:
+        # 가장 오래 기다린 도메인의 delivery를 limit개까지 가져간다
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT domain FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return []
+
+                rows = self._db.execute(
+                    "SELECT id, message_id, domain, recipients, to_header, subject, "
+                    "body, subtype, attempts FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt_at <= ? AND domain = ? "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (now, row[0], limit),
+                ).fetchall()
+                self._db.executemany(
+                    "UPDATE outbox SET status = 'sending', claimed_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    [(now, r[0]) for r in rows],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+        return [
+            Delivery(
+                id=r[0],
+                message_id=r[1],
+                domain=r[2],
+                recipients=json.loads(r[3]),
+                to_header=json.loads(r[4]),
+                subject=r[5],
+                body=r[6],
+                subtype=r[7],
+                attempts=r[8] + 1,
+            )
+            for r in rows
+        ]
+
+    def mark_sent(self, delivery_id: int, error: Optional[str] = None):
+        # 일부 수신자만 거절된 경우 error에 남긴다
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET status = 'sent', last_error = ? WHERE id = ?",
+                (error, delivery_id),
+            )
+
+    def mark_failed(
+        self,
+        delivery: Delivery,
+        error: str,
+        max_attempts: int,
+        backoff: float,
+        permanent: bool = False,
+    ):
+        with self._lock:
+            if permanent or delivery.attempts >= max_attempts:
+                self._db.execute(
+                    "UPDATE outbox SET status = 'failed', last_error = ? WHERE id = ?",
+                    (error[:1000], delivery.id),
+                )
+            else:
+                # 지수 백오프로 재시도
+                next_attempt_at = time.time() + backoff * 2 ** (delivery.attempts - 1)
+                self._db.execute(
+                    "UPDATE outbox SET status = 'pending', last_error = ?, "
+                    "next_attempt_at = ? WHERE id = ?",
+                    (error[:1000], next_attempt_at, delivery.id),
+                )
+
+    def requeue_stale(self, timeout: float) -> int:
+        # 발송 중에 프로세스가 죽은 delivery를 되돌린다
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE outbox SET status = 'pending' "
+                "WHERE status = 'sending' AND claimed_at < ?",
+                (time.time() - timeout,),
+            )
+            return cursor.rowcount
+
+    def status(self, message_id: str) -> Optional[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT domain, recipients, status, attempts, last_error FROM outbox "
+                "WHERE message_id = ? ORDER BY id",
+                (message_id,),
+            ).fetchall()
+        if not rows:
+            return None
+        return {
+            "id": message_id,
+            "deliveries": [
+                {
+                    "domain": r[0],
+                    "recipients": json.loads(r[1]),
+                    "status": r[2],
+                    "attempts": r[3],
+                    "last_error": r[4],
+                }
+                for r in rows
+            ],
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, count(*) FROM outbox GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+
+outbox = Outbox(settings.MAIL_OUTBOX_PATH)
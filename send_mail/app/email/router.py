@@ -1,19 +1,55 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, status
+from jinja2 import TemplateError, TemplateNotFound
 
-from app.email.service import send_email
-from app.schemas import EmailSchema
+from app.email.service import (
+    get_email_status,
+    send_bulk_template_email,
+    send_email,
+    send_template_email,
+)
+from app.schemas import BulkTemplateEmailSchema, EmailSchema, TemplateEmailSchema
 
 router = APIRouter()
 
 
-@router.post("/send-email/")
+@router.post("/send-email/", status_code=status.HTTP_202_ACCEPTED)
 async def send_email_route(email: EmailSchema):
     try:
         email_data = email.dict()
-        await send_email(email_data)
-    except HTTPException as e:
-        raise e
+        message_id = await send_email(email_data)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue email: {str(e)}")
 
-    return {"message": "Email sent successfully"}
+    return {"message": "Email queued", "id": message_id}
+
+
+@router.post("/send-template/", status_code=status.HTTP_202_ACCEPTED)
+async def send_template_route(email: TemplateEmailSchema):
+    try:
+        message_id = await send_template_email(email.dict())
+    except TemplateNotFound as e:
+        raise HTTPException(status_code=404, detail=f"Template not found: {e.name}")
+    except TemplateError as e:
+        raise HTTPException(status_code=400, detail=f"Template error: {str(e)}")
+
+    return {"message": "Email queued", "id": message_id}
+
+
+@router.post("/send-template/bulk/", status_code=status.HTTP_202_ACCEPTED)
+async def send_bulk_template_route(email: BulkTemplateEmailSchema):
+    try:
+        queued = await send_bulk_template_email(email.dict())
+    except TemplateNotFound as e:
+        raise HTTPException(status_code=404, detail=f"Template not found: {e.name}")
+    except TemplateError as e:
+        raise HTTPException(status_code=400, detail=f"Template error: {str(e)}")
+
+    return {"message": "Emails queued", "queued": queued}
+
+
+@router.get("/send-email/{message_id}")
+async def email_status_route(message_id: str):
+    email_status = await get_email_status(message_id)
+    if email_status is None:
+        raise HTTPException(status_code=404, detail="Email not found")
+    return email_status
@@ -1,30 +1,47 @@
-from fastapi import HTTPException
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
-
-from app.config import settings
-
-conn_config = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=settings.MAIL_USE_TLS,
-    MAIL_SSL_TLS=settings.MAIL_USE_SSL,
-)
-
-fast_mail = FastMail(conn_config)
-
-
-async def send_email(email_data: dict):
-    try:
-        message = MessageSchema(
-            subject=email_data["subject"],
-            recipients=email_data["recipients"],
-            body=email_data["body"],
-            subtype="html",
-        )
-        await fast_mail.send_message(message)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
+import asyncio
+from typing import Optional
+
+from app.email.delivery import delivery_pool
+from app.email.outbox import outbox
+from app.email.templates import env, render, template_renderer
+
+
+async def send_email(email_data: dict) -> str:
+    # 바로 보내지 않고 대기열에 넣은 뒤 워커를 깨운다
+    message_id = await asyncio.to_thread(
+        outbox.enqueue, {**email_data, "subtype": "html"}
+    )
+    delivery_pool.notify()
+    return message_id
+
+
+async def send_template_email(email_data: dict) -> str:
+    subject, body = await asyncio.to_thread(
+        render, email_data["template"], email_data["subject"], email_data["context"]
+    )
+    return await send_email(
+        {"recipients": email_data["recipients"], "subject": subject, "body": body}
+    )
+
+
+async def send_bulk_template_email(email_data: dict) -> int:
+    # 템플릿이 없거나 문법 오류면 렌더링 전에 실패
+    await asyncio.to_thread(env.get_template, email_data["template"])
+
+    items = [
+        (recipient["email"], recipient["context"])
+        for recipient in email_data["recipients"]
+    ]
+    messages = []
+    # 전부 렌더링한 뒤 한 트랜잭션으로 넣는다, 중간에 실패하면 한 통도 대기열에 남지 않는다
+    async for chunk in template_renderer.render_many(
+        email_data["template"], email_data["subject"], items
+    ):
+        messages.extend(chunk)
+    await asyncio.to_thread(outbox.enqueue_many, messages)
+    delivery_pool.notify()
+    return len(messages)
+
+
+async def get_email_status(message_id: str) -> Optional[dict]:
+    return await asyncio.to_thread(outbox.status, message_id)
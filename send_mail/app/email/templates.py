@@ -0,0 +1,113 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import AsyncIterator, Optional
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from jinja2.sandbox import SandboxedEnvironment
+
+from app.config import settings
+
+# 한 번 컴파일한 템플릿은 캐시하고, auto_reload로 파일 mtime이 바뀌면 다시 읽는다
+env = Environment(
+    loader=FileSystemLoader(settings.TEMPLATE_FOLDER),
+    autoescape=select_autoescape(["html", "htm", "xml"]),
+    auto_reload=True,
+    cache_size=settings.TEMPLATE_CACHE_SIZE,
+)
+
+# 제목은 요청에서 그대로 받으므로 샌드박스에서 컴파일하고 자동 이스케이프하지 않는다
+subject_env = SandboxedEnvironment(autoescape=False)
+_subject_cache: dict[str, Template] = {}
+
+
+def subject_template(source: str) -> Template:
+    template = _subject_cache.get(source)
+    if template is None:
+        template = subject_env.from_string(source)
+        if len(_subject_cache) < settings.TEMPLATE_CACHE_SIZE:
+            _subject_cache[source] = template
+    return template
+
+
+def render(template_name: str, subject: str, context: dict) -> tuple[str, str]:
+    return (
+        subject_template(subject).render(context),
+        env.get_template(template_name).render(context),
+    )
+
+
+def render_chunk(
+    template_name: str, subject: str, items: list[tuple[str, dict]]
+) -> list[dict]:
+    # 프로세스 풀에서 실행, 워커마다 자기 env 캐시를 쓴다
+    template = env.get_template(template_name)
+    subject_tpl = subject_template(subject)
+    return [
+        {
+            "recipients": [recipient],
+            "subject": subject_tpl.render(context),
+            "body": template.render(context),
+            "subtype": "html",
+        }
+        for recipient, context in items
+    ]
+
+
+class TemplateRenderer:
+    """대량 발송용 렌더러, 청크 단위로 프로세스 풀에 나눠 렌더링"""
+
+    def __init__(self, workers: Optional[int], chunk_size: int):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def render_many(
+        self, template_name: str, subject: str, items: list[tuple[str, dict]]
+    ) -> AsyncIterator[list[dict]]:
+        """렌더링이 끝난 청크부터 순서와 상관없이 내보낸다
+
+        풀에 한 번에 올리는 청크는 워커 수의 두 배까지만 둔다.
+        """
+        loop = asyncio.get_running_loop()
+        starts = iter(range(0, len(items), self.chunk_size))
+        pending: set[asyncio.Future] = set()
+        try:
+            while True:
+                for start in islice(starts, self.workers * 2 - len(pending)):
+                    pending.add(
+                        loop.run_in_executor(
+                            self.executor,
+                            render_chunk,
+                            template_name,
+                            subject,
+                            items[start : start + self.chunk_size],
+                        )
+                    )
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+template_renderer = TemplateRenderer(
+    settings.TEMPLATE_RENDER_WORKERS, settings.TEMPLATE_RENDER_CHUNK
+)
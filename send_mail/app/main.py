@@ -1,6 +1,23 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.email.delivery import delivery_pool
 from app.email.router import router as email_router
+from app.email.templates import template_renderer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    workers = asyncio.create_task(delivery_pool.run())
+
+    yield
+
+    workers.cancel()
+    await asyncio.gather(workers, return_exceptions=True)
+    template_renderer.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(email_router)
@@ -5,3 +5,21 @@ class EmailSchema(BaseModel):
     recipients: list
     subject: str
     body: str
+
+
+class TemplateEmailSchema(BaseModel):
+    recipients: list
+    subject: str
+    template: str
+    context: dict = {}
+
+
+class BulkRecipient(BaseModel):
+    email: str
+    context: dict = {}
+
+
+class BulkTemplateEmailSchema(BaseModel):
+    template: str
+    subject: str
+    recipients: list[BulkRecipient]
@@ -0,0 +1,144 @@
+import re
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Date, cast, func, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.activity.models import Activity, ActivityDaily
+from app.core.config import settings
+
+PARTITION_NAME = re.compile(r"activites_(\d{4})_(\d{2})")
+
+
+def add_months(month: date, months: int) -> date:
+    years, index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"activites_{month:%Y_%m}"
+
+
+async def list_partitions(db: AsyncSession) -> dict[date, str]:
+    # 월 파티션만 (default 파티션 제외), 월 시작일 -> 테이블 이름
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'activites'::regclass"
+        )
+    )
+    partitions = {}
+    for name in result.scalars():
+        match = PARTITION_NAME.fullmatch(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+async def ensure_partitions_svc(db: AsyncSession, months_ahead: int) -> list[str]:
+    # 미리 만들어 두지 않으면 새 달의 행이 default 파티션으로 들어간다
+    existing = await list_partitions(db)
+    this_month = datetime.utcnow().date().replace(day=1)
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(this_month, offset)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        await db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF activites "
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            )
+        )
+        created.append(name)
+    await db.commit()
+    return created
+
+
+async def compact_likes_svc(db: AsyncSession, until: date) -> int:
+    """until 전날까지의 좋아요 활동을 (게시물, 일) 집계로 접는다
+
+    지나간 날의 활동은 더 바뀌지 않으므로 마지막으로 접은 날 다음부터만 읽고,
+    같은 날을 다시 접어도 덮어쓰기라 결과가 같다.
+    """
+    last_day = await db.scalar(select(func.max(ActivityDaily.day)))
+    day = cast(Activity.timestamp, Date)
+
+    query = (
+        select(
+            Activity.liked_post_id,
+            day,
+            func.min(Activity.username),
+            func.count(),
+            array_agg(
+                aggregate_order_by(Activity.username_like, Activity.timestamp.desc())
+            )[1],
+            func.max(Activity.liked_post_image),
+        )
+        .where(
+            Activity.liked_post_id.is_not(None),
+            Activity.timestamp < datetime.combine(until, datetime.min.time()),
+        )
+        .group_by(Activity.liked_post_id, day)
+    )
+    if last_day is not None:
+        # timestamp 범위 조건이라 해당 파티션만 읽는다
+        since = last_day + timedelta(days=1)
+        query = query.where(
+            Activity.timestamp >= datetime.combine(since, datetime.min.time())
+        )
+
+    stmt = insert(ActivityDaily).from_select(
+        [
+            ActivityDaily.liked_post_id,
+            ActivityDaily.day,
+            ActivityDaily.username,
+            ActivityDaily.like_count,
+            ActivityDaily.last_liker,
+            ActivityDaily.liked_post_image,
+        ],
+        query,
+    )
+    result = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ActivityDaily.liked_post_id, ActivityDaily.day],
+            set_={
+                "like_count": stmt.excluded.like_count,
+                "last_liker": stmt.excluded.last_liker,
+                "liked_post_image": stmt.excluded.liked_post_image,
+            },
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def drop_expired_partitions_svc(db: AsyncSession, keep_from: date) -> list[str]:
+    # keep_from 이전에 끝나는 파티션은 떼어내고 통째로 DROP, 행 단위 DELETE는 하지 않는다
+    dropped = []
+    for month, name in sorted((await list_partitions(db)).items()):
+        if add_months(month, 1) > keep_from:
+            break
+        await db.execute(text(f"ALTER TABLE activites DETACH PARTITION {name}"))
+        await db.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    await db.commit()
+    return dropped
+
+
+async def run_activity_maintenance_svc(db: AsyncSession) -> dict:
+    today = datetime.utcnow().date()
+    # 보존 기간이 집계 기준보다 짧으면 접기 전에 지워지므로 긴 쪽을 쓴다
+    compact_until = today - timedelta(days=settings.ACTIVITY_COMPACT_AFTER_DAYS)
+    keep_from = today - timedelta(
+        days=max(settings.ACTIVITY_RETENTION_DAYS, settings.ACTIVITY_COMPACT_AFTER_DAYS)
+    )
+
+    created = await ensure_partitions_svc(db, settings.ACTIVITY_PARTITIONS_AHEAD)
+    compacted = await compact_likes_svc(db, compact_until)
+    dropped = await drop_expired_partitions_svc(db, keep_from)
+    return {"created": created, "compacted": compacted, "dropped": dropped}
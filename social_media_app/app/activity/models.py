@@ -1,16 +1,28 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 
 from app.core.db import Base
 
 
 class Activity(Base):
+    # timestamp 기준 월별 파티션 테이블, 파티션 키가 PK에 포함되어야 한다
     __tablename__ = "activites"
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String, nullable=False)
-    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow())
+    timestamp = Column(
+        DateTime, primary_key=True, nullable=False, default=datetime.utcnow
+    )
 
     liked_post_id = Column(Integer)
     username_like = Column(String)
@@ -18,3 +30,67 @@ class Activity(Base):
 
     followed_username = Column(String)
     followed_user_pic = Column(String)
+
+    __table_args__ = (
+        Index("ix_activites_username_timestamp", "username", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+
+class ActivityGroup(Base):
+    """같은 대상에 대한 활동을 시간 구간별로 묶은 알림 ("A, B 외 48명이 좋아합니다")"""
+
+    __tablename__ = "activity_groups"
+
+    id = Column(Integer, primary_key=True)
+    username = Column(String, nullable=False)
+    # like: target_id = post id, follow: target_id = 0
+    kind = Column(String(16), nullable=False)
+    target_id = Column(Integer, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+
+    actor_count = Column(Integer, nullable=False, default=0)
+    # 가장 최근 두 명
+    actor_1 = Column(String)
+    actor_2 = Column(String)
+    image = Column(String)
+
+    created_dt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_dt = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("username", "kind", "target_id", "bucket_start"),
+        Index("ix_activity_groups_username_updated_dt", "username", "updated_dt"),
+    )
+
+
+class ActivityGroupActor(Base):
+    """그룹에 참여한 사용자, 같은 사람이 취소 후 다시 해도 actor_count는 한 번만 센다"""
+
+    __tablename__ = "activity_group_actors"
+
+    group_id = Column(
+        Integer,
+        ForeignKey("activity_groups.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    actor = Column(String, primary_key=True)
+
+
+class ActivityDaily(Base):
+    """오래된 좋아요 활동을 게시물/일 단위로 접은 집계, 원본 파티션을 지워도 남는다"""
+
+    __tablename__ = "activity_daily"
+
+    liked_post_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    # 게시물 작성자
+    username = Column(String, nullable=False)
+    like_count = Column(Integer, nullable=False)
+    last_liker = Column(String)
+    liked_post_image = Column(String)
+
+    __table_args__ = (
+        Index("ix_activity_daily_username_day", "username", "day"),
+        Index("ix_activity_daily_day", "day"),
+    )
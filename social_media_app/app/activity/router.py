@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
 
-from app.activity.service import get_activites_by_username
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.activity.schemas import ActivityFeed, PostLikesHistory
+from app.activity.service import (
+    get_activites_by_username,
+    get_activity_feed_svc,
+    get_post_likes_history_svc,
+)
 from app.core.db import get_db
 
 router = APIRouter(prefix="/activity", tags=["activity"])
@@ -9,6 +17,29 @@ router = APIRouter(prefix="/activity", tags=["activity"])
 
 @router.get("/user/{username}")
 async def activity(
-    username: str, page: int = 1, limit: int = 10, db: Session = Depends(get_db)
+    username: str, page: int = 1, limit: int = 10, db: AsyncSession = Depends(get_db)
 ):
     return await get_activites_by_username(db, username, page, limit)
+
+
+@router.get("/user/{username}/grouped", response_model=ActivityFeed)
+async def grouped_activity(
+    username: str,
+    before: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        return await get_activity_feed_svc(db, username, before, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/post/{post_id}/daily", response_model=PostLikesHistory)
+async def post_likes_history(
+    post_id: int,
+    before: Optional[date] = None,
+    limit: int = Query(30, ge=1, le=366),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_post_likes_history_svc(db, post_id, before, limit)
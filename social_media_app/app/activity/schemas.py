@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
 
 from pydantic import BaseModel
 
@@ -21,3 +22,53 @@ class Activity(ActivityBase):
 
     class Config:
         orm_mode = True
+
+
+class ActivityGroup(ActivityBase):
+    kind: str
+    target_id: int
+    actors: list[str]
+    actor_count: int
+    image: Optional[str] = None
+    updated_dt: datetime
+    summary: str
+
+    @classmethod
+    def from_group(cls, group) -> "ActivityGroup":
+        actors = [actor for actor in (group.actor_1, group.actor_2) if actor]
+        others = group.actor_count - len(actors)
+        if others > 0:
+            names = f"{', '.join(actors)} and {others} other{'s' if others > 1 else ''}"
+        else:
+            names = " and ".join(actors)
+        action = "liked your post" if group.kind == "like" else "started following you"
+        return cls(
+            username=group.username,
+            kind=group.kind,
+            target_id=group.target_id,
+            actors=actors,
+            actor_count=group.actor_count,
+            image=group.image,
+            updated_dt=group.updated_dt,
+            summary=f"{names} {action}",
+        )
+
+
+class ActivityFeed(BaseModel):
+    groups: list[ActivityGroup] = []
+    next_cursor: Optional[str] = None
+
+
+class PostLikesDay(BaseModel):
+    day: date
+    like_count: int
+    last_liker: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PostLikesHistory(BaseModel):
+    liked_post_id: int
+    days: list[PostLikesDay] = []
+    next_cursor: Optional[date] = None
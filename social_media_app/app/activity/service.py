@@ -1,18 +1,197 @@
-from sqlalchemy.orm import Session
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Optional
 
-from app.activity.models import Activity
+from sqlalchemy import case, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.activity.models import (
+    Activity,
+    ActivityDaily,
+    ActivityGroup,
+    ActivityGroupActor,
+)
+from app.activity.schemas import ActivityFeed, PostLikesDay, PostLikesHistory
+from app.activity.schemas import ActivityGroup as ActivityGroupSchema
+from app.core.config import settings
+
+EPOCH = datetime(1970, 1, 1)
 
 
 async def get_activites_by_username(
-    db: Session, username: str, page: int = 1, limit: int = 10
+    db: AsyncSession, username: str, page: int = 1, limit: int = 10
 ) -> list[Activity]:
     offset = (page - 1) * limit
 
-    return (
-        db.query(Activity)
-        .filter(Activity.username == username)
+    result = await db.execute(
+        select(Activity)
+        .where(Activity.username == username)
         .order_by(Activity.timestamp.desc())
         .offset(offset)
         .limit(limit)
-        .all()
+    )
+    return result.scalars().all()
+
+
+def group_activities(activities: list[dict]) -> list[dict]:
+    # 한 INSERT 안에서 같은 그룹을 두 번 갱신할 수 없으므로 먼저 메모리에서 합친다
+    window = timedelta(seconds=settings.ACTIVITY_GROUP_WINDOW)
+    groups: dict[tuple, dict] = {}
+    for activity in activities:
+        timestamp = activity.get("timestamp") or datetime.utcnow()
+        if activity.get("liked_post_id") is not None:
+            kind, target_id = "like", activity["liked_post_id"]
+            actor, image = activity["username_like"], activity.get("liked_post_image")
+        else:
+            kind, target_id = "follow", 0
+            actor, image = activity["followed_username"], activity.get(
+                "followed_user_pic"
+            )
+
+        # timedelta 나머지는 마이크로초 정수 연산이라 경계 값이 다른 구간으로 새지 않는다
+        bucket_start = timestamp - (timestamp - EPOCH) % window
+        key = (activity["username"], kind, target_id, bucket_start)
+
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {
+                "username": activity["username"],
+                "kind": kind,
+                "target_id": target_id,
+                "bucket_start": bucket_start,
+                "actor_count": 0,
+                "actors": {actor},
+                "actor_1": actor,
+                "actor_2": None,
+                "image": image,
+                "updated_dt": timestamp,
+            }
+            continue
+
+        group["actors"].add(actor)
+        if actor != group["actor_1"]:
+            group["actor_2"] = group["actor_1"]
+            group["actor_1"] = actor
+        group["image"] = image
+        group["updated_dt"] = max(group["updated_dt"], timestamp)
+    return list(groups.values())
+
+
+async def record_activity_groups_svc(db: AsyncSession, activities: list[dict]):
+    # 쓰기 시점에 그룹 행을 upsert, commit은 호출한 쪽에서
+    groups = group_activities(activities)
+    if not groups:
+        return
+
+    actors = {
+        (group["username"], group["kind"], group["target_id"], group["bucket_start"]): (
+            group.pop("actors")
+        )
+        for group in groups
+    }
+    stmt = insert(ActivityGroup).values(groups)
+    excluded = stmt.excluded
+    result = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                ActivityGroup.username,
+                ActivityGroup.kind,
+                ActivityGroup.target_id,
+                ActivityGroup.bucket_start,
+            ],
+            set_={
+                "actor_2": case(
+                    (excluded.actor_2.is_not(None), excluded.actor_2),
+                    (ActivityGroup.actor_1 == excluded.actor_1, ActivityGroup.actor_2),
+                    else_=ActivityGroup.actor_1,
+                ),
+                "actor_1": excluded.actor_1,
+                "image": excluded.image,
+                "updated_dt": excluded.updated_dt,
+            },
+        ).returning(
+            ActivityGroup.id,
+            ActivityGroup.username,
+            ActivityGroup.kind,
+            ActivityGroup.target_id,
+            ActivityGroup.bucket_start,
+        )
+    )
+
+    # 처음 참여한 사용자만 actor_count에 더한다
+    rows = [
+        {"group_id": group_id, "actor": actor}
+        for group_id, *key in result.all()
+        for actor in actors[tuple(key)]
+    ]
+    result = await db.execute(
+        insert(ActivityGroupActor)
+        .values(rows)
+        .on_conflict_do_nothing()
+        .returning(ActivityGroupActor.group_id)
+    )
+    added = Counter(result.scalars())
+    if added:
+        await db.execute(
+            update(ActivityGroup)
+            .where(ActivityGroup.id.in_(added))
+            .values(
+                actor_count=ActivityGroup.actor_count
+                + case(added, value=ActivityGroup.id)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def encode_cursor(group: ActivityGroup) -> str:
+    return f"{group.updated_dt.isoformat()},{group.id}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        updated_dt, group_id = cursor.rsplit(",", 1)
+        return datetime.fromisoformat(updated_dt), int(group_id)
+    except ValueError as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+async def get_activity_feed_svc(
+    db: AsyncSession, username: str, before: Optional[str] = None, limit: int = 20
+) -> ActivityFeed:
+    # (username, updated_dt) 인덱스를 따라 최신 그룹부터 keyset 페이지네이션
+    query = select(ActivityGroup).where(ActivityGroup.username == username)
+    if before is not None:
+        query = query.where(
+            tuple_(ActivityGroup.updated_dt, ActivityGroup.id) < decode_cursor(before)
+        )
+    result = await db.execute(
+        query.order_by(ActivityGroup.updated_dt.desc(), ActivityGroup.id.desc()).limit(
+            limit
+        )
+    )
+    groups = result.scalars().all()
+
+    next_cursor = encode_cursor(groups[-1]) if len(groups) == limit else None
+    return ActivityFeed(
+        groups=[ActivityGroupSchema.from_group(group) for group in groups],
+        next_cursor=next_cursor,
+    )
+
+
+async def get_post_likes_history_svc(
+    db: AsyncSession, post_id: int, before: Optional[date] = None, limit: int = 30
+) -> PostLikesHistory:
+    # 집계로 접힌 날만 있다, 최근 ACTIVITY_COMPACT_AFTER_DAYS 일은 원본 활동에서 본다
+    query = select(ActivityDaily).where(ActivityDaily.liked_post_id == post_id)
+    if before is not None:
+        query = query.where(ActivityDaily.day < before)
+    result = await db.execute(query.order_by(ActivityDaily.day.desc()).limit(limit))
+    days = result.scalars().all()
+
+    next_cursor = days[-1].day if len(days) == limit else None
+    return PostLikesHistory(
+        liked_post_id=post_id,
+        days=[PostLikesDay.model_validate(day) for day in days],
+        next_cursor=next_cursor,
     )
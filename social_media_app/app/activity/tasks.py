@@ -0,0 +1,21 @@
+import asyncio
+import logging
+
+from app.activity.maintenance import run_activity_maintenance_svc
+from app.core.config import settings
+from app.core.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def activity_maintenance():
+    # 시작하자마자 한 번 돌려 이번 달과 다음 달 파티션을 확보한다
+    while True:
+        try:
+            async with SessionLocal() as db:
+                result = await run_activity_maintenance_svc(db)
+            if any(result.values()):
+                logger.info("activity maintenance: %s", result)
+        except Exception:
+            logger.exception("activity maintenance failed")
+        await asyncio.sleep(settings.ACTIVITY_MAINTENANCE_INTERVAL)
@@ -6,7 +6,9 @@ from sqlalchemy import engine_from_config, pool
 from app.activity.models import Base as ActivityBase
 from app.auth.models import Base as AuthBase
 from app.core.config import settings
+from app.media.models import Base as MediaBase
 from app.post.models import Base as PostBase
+from app.timeline.models import Base as TimelineBase
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -30,6 +32,8 @@ if config.config_file_name is not None:
 target_metadata = AuthBase.metadata
 target_metadata = PostBase.metadata
 target_metadata = ActivityBase.metadata
+target_metadata = TimelineBase.metadata
+target_metadata = MediaBase.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
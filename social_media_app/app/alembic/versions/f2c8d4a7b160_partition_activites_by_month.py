@@ -0,0 +1,147 @@
+"""Partition activites by month and add activity_daily
+
+Revision ID: f2c8d4a7b160
+Revises: e7a3c6d91f05
+Create Date: 2024-04-16 09:31:58.226714
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8d4a7b160"
+down_revision: Union[str, None] = "e7a3c6d91f05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_daily",
+        sa.Column("liked_post_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("like_count", sa.Integer(), nullable=False),
+        sa.Column("last_liker", sa.String(), nullable=True),
+        sa.Column("liked_post_image", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("liked_post_id", "day"),
+    )
+    op.create_index("ix_activity_daily_day", "activity_daily", ["day"], unique=False)
+    op.create_index(
+        "ix_activity_daily_username_day",
+        "activity_daily",
+        ["username", "day"],
+        unique=False,
+    )
+
+    # 기존 테이블은 옆으로 옮겨 두고 같은 이름의 파티션 테이블을 만든다
+    op.drop_index("ix_activites_username_timestamp", table_name="activites")
+    op.rename_table("activites", "activites_legacy")
+    op.execute(
+        "ALTER TABLE activites_legacy RENAME CONSTRAINT activites_pkey TO activites_legacy_pkey"
+    )
+
+    op.create_table(
+        "activites",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('activites_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("liked_post_id", sa.Integer(), nullable=True),
+        sa.Column("username_like", sa.String(), nullable=True),
+        sa.Column("liked_post_image", sa.String(), nullable=True),
+        sa.Column("followed_username", sa.String(), nullable=True),
+        sa.Column("followed_user_pic", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id", "timestamp"),
+        postgresql_partition_by="RANGE (timestamp)",
+    )
+    op.execute("ALTER SEQUENCE activites_id_seq OWNED BY activites.id")
+
+    # 가장 오래된 활동이 있는 달부터 두 달 뒤까지 월 파티션
+    op.execute("""
+        DO $$
+        DECLARE
+            month date := date_trunc(
+                'month', coalesce((SELECT min(timestamp) FROM activites_legacy), now())
+            )::date;
+            last_month date := (date_trunc('month', now()) + interval '2 months')::date;
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF activites FOR VALUES FROM (%L) TO (%L)',
+                    'activites_' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+    op.execute("CREATE TABLE activites_default PARTITION OF activites DEFAULT")
+
+    op.execute(
+        "INSERT INTO activites (id, username, timestamp, liked_post_id, username_like, "
+        "liked_post_image, followed_username, followed_user_pic) "
+        "SELECT id, username, timestamp, liked_post_id, username_like, "
+        "liked_post_image, followed_username, followed_user_pic FROM activites_legacy"
+    )
+    op.drop_table("activites_legacy")
+    # 부모에 만든 인덱스는 모든 파티션(이후 생성분 포함)에 적용된다
+    op.create_index(
+        "ix_activites_username_timestamp",
+        "activites",
+        ["username", "timestamp"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activites_username_timestamp", table_name="activites")
+    op.rename_table("activites", "activites_partitioned")
+    op.execute(
+        "ALTER TABLE activites_partitioned RENAME CONSTRAINT activites_pkey TO activites_partitioned_pkey"
+    )
+
+    op.create_table(
+        "activites",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('activites_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("liked_post_id", sa.Integer(), nullable=True),
+        sa.Column("username_like", sa.String(), nullable=True),
+        sa.Column("liked_post_image", sa.String(), nullable=True),
+        sa.Column("followed_username", sa.String(), nullable=True),
+        sa.Column("followed_user_pic", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="activites_pkey"),
+    )
+    op.execute("ALTER SEQUENCE activites_id_seq OWNED BY activites.id")
+    op.execute(
+        "INSERT INTO activites (id, username, timestamp, liked_post_id, username_like, "
+        "liked_post_image, followed_username, followed_user_pic) "
+        "SELECT id, username, timestamp, liked_post_id, username_like, "
+        "liked_post_image, followed_username, followed_user_pic FROM activites_partitioned"
+    )
+    # 파티션까지 함께 삭제된다
+    op.drop_table("activites_partitioned")
+    op.create_index(
+        "ix_activites_username_timestamp",
+        "activites",
+        ["username", "timestamp"],
+        unique=False,
+    )
+
+    op.drop_index("ix_activity_daily_username_day", table_name="activity_daily")
+    op.drop_index("ix_activity_daily_day", table_name="activity_daily")
+    op.drop_table("activity_daily")
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from sqlalchemy import event
+
+from app.auth.models import User
+from app.core.config import settings
+
+
+class UserCache:
+    """(user id, 토큰 iat) 기준으로 인증된 사용자를 보관하는 TTL + LRU 캐시"""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[int, int], tuple[float, User]] = OrderedDict()
+        self._keys_by_user: dict[int, set[tuple[int, int]]] = {}
+        self.hits = 0
+        self.misses = 0
+        # metrics_hook("hit" | "miss" | "evict")
+        self.metrics_hook: Optional[Callable[[str], None]] = None
+
+    def _report(self, name: str):
+        if self.metrics_hook:
+            self.metrics_hook(name)
+
+    def get(self, user_id: int, iat: int) -> Optional[User]:
+        key = (user_id, iat)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            self._report("miss")
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._report("hit")
+        return entry[1]
+
+    def set(self, user_id: int, iat: int, user: User):
+        key = (user_id, iat)
+        self._entries[key] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._report("evict")
+
+    def invalidate(self, user_id: int):
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def _remove(self, key: tuple[int, int]):
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+user_cache = UserCache(settings.AUTH_CACHE_MAXSIZE, settings.AUTH_CACHE_TTL)
+
+
+# User 행이 수정되거나 삭제되면 캐시에서 제거
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_cached_user(mapper, connection, target: User):
+    user_cache.invalidate(target.id)
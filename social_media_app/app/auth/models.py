@@ -1,6 +1,15 @@
 from datetime import datetime
 
-from sqlalchemy import DATE, Column, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import (
+    DATE,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import relationship
 
 from app.auth.enum import Gender
@@ -22,6 +31,11 @@ class Follow(Base):
         "User", foreign_keys=[following_id], back_populates="followings"
     )
 
+    # (follower_id, following_id)는 PK가 팔로잉 목록을, 이 인덱스가 팔로워 목록을 맡는다
+    __table_args__ = (
+        Index("ix_follows_following_id_follower_id", "following_id", "follower_id"),
+    )
+
 
 class User(Base):
     __tablename__ = "users"
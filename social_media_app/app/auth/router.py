@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.schemas import UserCreate, UserUpdate
 from app.auth.service import (
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-async def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
     existing = await existing_user(user.username, user.email, db)
     if existing:
         raise HTTPException(
@@ -34,7 +34,7 @@ async def signup(user: UserCreate, db: Session = Depends(get_db)):
 
 @router.post("/token", status_code=status.HTTP_201_CREATED)
 async def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ):
     db_user = await authenticate_user(form_data.username, form_data.password, db)
     if not db_user:
@@ -48,7 +48,7 @@ async def login(
 
 
 @router.get("/profile", status_code=status.HTTP_200_OK, response_model=UserUpdate)
-async def current_user(token: str, db: Session = Depends(get_db)):
+async def current_user(token: str, db: AsyncSession = Depends(get_db)):
     db_user = await get_current_user(token, db)
     if not db_user:
         raise HTTPException(
@@ -59,7 +59,10 @@ async def current_user(token: str, db: Session = Depends(get_db)):
 
 @router.put("/update/{username}", status_code=status.HTTP_204_NO_CONTENT)
 async def update_user(
-    username: str, token: str, user_update: UserUpdate, db: Session = Depends(get_db)
+    username: str,
+    token: str,
+    user_update: UserUpdate,
+    db: AsyncSession = Depends(get_db),
 ):
     db_user = await get_current_user(token, db)
     if db_user.username != username:
@@ -36,3 +36,9 @@ class User(UserBase):
 
     class Config:
         orm_mod: True
+
+
+# DB 조회 없이 토큰 클레임만으로 만든 사용자 정보
+class Principal(BaseModel):
+    id: int
+    username: str
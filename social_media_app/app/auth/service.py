@@ -3,38 +3,49 @@ from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import or_, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from app.auth.cache import user_cache
 from app.auth.models import User
+from app.auth.schemas import Principal
 from app.auth.schemas import User as UserSchema
 from app.auth.schemas import UserCreate, UserUpdate
 from app.core.config import settings
 from app.core.db import get_db
+from app.core.hashing import password_hasher
+from app.media.service import enqueue_media_svc
+from app.media.worker import media_worker
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="v1/auth/token")
 
 
 # username으로 조회
-async def get_user_by_username(username: str, db: Session = Depends(get_db)) -> User:
-    return db.query(User).filter(User.username == username).first()
+async def get_user_by_username(
+    username: str, db: AsyncSession = Depends(get_db)
+) -> User:
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
 
 
-async def get_user_by_user_id(db: Session, user_id: int) -> User:
-    return db.query(User).filter(User.id == user_id).first()
+async def get_user_by_user_id(db: AsyncSession, user_id: int) -> User:
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
 
 
 # 유저 체크
 async def existing_user(
-    username: str, email: str, db: Session = Depends(get_db)
+    username: str, email: str, db: AsyncSession = Depends(get_db)
 ) -> bool:
-    db_username = db.query(User).filter(User.username == username).first()
-    db_email = db.query(User).filter(User.email == email).first()
+    result = await db.execute(
+        select(User.id)
+        .where(or_(User.username == username, User.email == email))
+        .limit(1)
+    )
 
-    if db_username or db_email:
+    if result.first():
         return True
 
     return False
@@ -43,50 +54,78 @@ async def existing_user(
 # 토큰 생성
 async def create_access_token(user: UserSchema) -> str:
     encode = {"sub": user.username, "id": user.id}
-    expires = datetime.utcnow() + timedelta(days=settings.EXPIRE_TIME)
-    encode.update({"exp": expires})
+    issued = datetime.utcnow()
+    expires = issued + timedelta(days=settings.EXPIRE_TIME)
+    encode.update({"iat": issued, "exp": expires})
     return jwt.encode(encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+# 토큰 검증 후 payload 반환
+def decode_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=settings.ALGORITHM)
+    except JWTError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        ) from exc
+
+    expires_timestamp = payload.get("exp")
+    if (
+        payload.get("sub") is None
+        or payload.get("id") is None
+        or expires_timestamp is None
+        or datetime.utcfromtimestamp(expires_timestamp) < datetime.utcnow()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    return payload
+
+
 # 현재 user 가져오기
 async def get_current_user(
-    token: str = Depends(oauth2_bearer), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_bearer), db: AsyncSession = Depends(get_db)
 ) -> User:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=settings.ALGORITHM)
-        username: str = payload.get("sub")
-        user_id: str = payload.get("id")
-        expires_timestamp = payload.get("exp")
-        expires = datetime.utcfromtimestamp(expires_timestamp)
-        if expires < datetime.utcnow():
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
-            )
-        if username is None or user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-            )
-        user = await get_user_by_username(username, db)
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-            )
+    payload = decode_token(token)
+    user_id: int = payload["id"]
+    # iat가 없는 기존 토큰은 0으로 취급
+    iat: int = payload.get("iat", 0)
+
+    user = user_cache.get(user_id, iat)
+    if user is not None:
         return user
-    except (JWTError, HTTPException) as exc:
+
+    user = await get_user_by_username(payload["sub"], db)
+    if user is None or user.id != user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
-        ) from exc
+        )
+    user_cache.set(user_id, iat, user)
+    return user
+
 
+# 읽기 전용 경로용, AUTH_TRUST_CLAIMS면 DB 조회 없이 클레임만 사용
+async def get_current_principal(
+    token: str = Depends(oauth2_bearer), db: AsyncSession = Depends(get_db)
+) -> Principal:
+    if settings.AUTH_TRUST_CLAIMS:
+        payload = decode_token(token)
+        return Principal(id=payload["id"], username=payload["sub"])
 
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+    user = await get_current_user(token, db)
+    return Principal(id=user.id, username=user.username)
+
+
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     try:
         db_user = User(
             name=user.name or None,
             username=user.username.lower().strip(),
             email=user.email.lower().strip(),
-            password_hash=bcrypt_context.hash(user.password),
+            password_hash=await password_hasher.hash(user.password),
             dob=user.dob or None,
             gender=user.gender or None,
             bio=user.bio or None,
@@ -94,8 +133,10 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)):
             profile_pic=user.profile_pic or None,
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await enqueue_media_svc(db, db_user.profile_pic)
+        await db.commit()
+        await db.refresh(db_user)
+        media_worker.notify()
         return db_user
     except IntegrityError as exc:
         await db.rollback()
@@ -105,16 +146,38 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)):
         ) from exc
 
 
-async def authenticate_user(username: str, password: str, db: Session) -> User:
+async def authenticate_user(username: str, password: str, db: AsyncSession) -> User:
     user = await get_user_by_username(username, db)
-    if not user or not bcrypt_context.verify(password, user.password_hash):
+    if not user:
+        return False
+
+    verified, new_hash = await password_hasher.verify_and_update(
+        password, user.password_hash
+    )
+    if not verified:
         return False
+
+    # cost 설정이 바뀌었으면 새 해시로 교체
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
     return user
 
 
 async def update_user(
-    db_user: UserSchema, user_update: UserUpdate, db: Session = Depends(get_db)
+    db_user: UserSchema, user_update: UserUpdate, db: AsyncSession = Depends(get_db)
 ):
-    for field, value in user_update.dict().items():
-        setattr(db_user, field, value or getattr(db_user, field))
-    db.commit()
+    # 캐시에서 온 detached 객체는 오래됐을 수 있으므로 현재 세션에서 다시 읽고
+    # 요청에 들어온 필드만 바꾼다 (merge하면 캐시의 카운터와 해시까지 덮어쓴다)
+    db_user = await db.get(User, db_user.id)
+    if db_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    for field, value in user_update.model_dump(exclude_unset=True).items():
+        if value:
+            setattr(db_user, field, value)
+    await enqueue_media_svc(db, db_user.profile_pic)
+    await db.commit()
+    media_worker.notify()
+    user_cache.invalidate(db_user.id)
@@ -14,9 +14,73 @@ class Settings(BaseSettings):
     ALGORITHM: str
     EXPIRE_TIME: int
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # 홈 타임라인 저장소 (postgres / memory)
+    TIMELINE_BACKEND: str = "postgres"
+    TIMELINE_MAX_LENGTH: int = 800
+    TIMELINE_TRIM_EVERY: int = 50
+    TIMELINE_CELEBRITY_THRESHOLD: int = 10000
+
+    # likes_count 보정 주기(초), 0이면 비활성화
+    LIKES_RECONCILE_INTERVAL: int = 600
+
+    # 좋아요 write-behind 버퍼
+    LIKE_WRITE_BEHIND: bool = False
+    LIKE_FLUSH_INTERVAL_MS: int = 500
+    LIKE_FLUSH_MAX_EVENTS: int = 1000
+
+    # 인증 사용자 캐시
+    AUTH_CACHE_TTL: int = 60
+    AUTH_CACHE_MAXSIZE: int = 10000
+    # 읽기 경로에서 DB 조회 없이 토큰 클레임을 신뢰
+    AUTH_TRUST_CLAIMS: bool = False
+
+    # 비밀번호 해시 워커 풀 (thread / process)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # 이미지 변환본 파이프라인, MEDIA_WORKERS가 0이면 비활성화
+    MEDIA_ROOT: str = "./media"
+    MEDIA_VARIANT_DIR: str = "./media/variants"
+    MEDIA_URL_PREFIX: str = "/media/variants"
+    MEDIA_WORKERS: int = 2
+    MEDIA_MAX_ATTEMPTS: int = 5
+    MEDIA_RETRY_BACKOFF: int = 30
+    MEDIA_POLL_INTERVAL: int = 5
+    MEDIA_JOB_TIMEOUT: int = 600
+
+    # 활동 알림을 묶는 시간 구간(초)
+    ACTIVITY_GROUP_WINDOW: int = 86400
+
+    # activites 월별 파티션 관리 주기(초), 0이면 비활성화
+    ACTIVITY_MAINTENANCE_INTERVAL: int = 3600
+    ACTIVITY_PARTITIONS_AHEAD: int = 2
+    # 이 기간이 지난 좋아요는 (게시물, 일) 집계로 접고, 보존 기간이 지난 파티션은 DROP
+    ACTIVITY_COMPACT_AFTER_DAYS: int = 30
+    ACTIVITY_RETENTION_DAYS: int = 180
+
+    # 팔로우 그래프 인메모리 인덱스, 시작할 때 follows 테이블에서 적재
+    FOLLOW_GRAPH_ENABLED: bool = True
+    FOLLOW_GRAPH_LOAD_BATCH: int = 10000
+    # 다른 워커에서 생긴 변경을 반영하려고 다시 적재하는 주기(초), 0이면 비활성화
+    FOLLOW_GRAPH_REBUILD_INTERVAL: int = 300
+    # 친구의 친구 추천에서 살펴볼 팔로잉 수 상한
+    SUGGESTION_FANOUT: int = 500
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
 
 settings = Settings()
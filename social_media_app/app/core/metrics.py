@@ -0,0 +1,59 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class PoolStats:
+    """커넥션 풀 사용량과 요청이 커넥션을 얻기까지 기다린 시간
+
+    좋아요 flush, 미디어 워커 같은 백그라운드 작업도 같은 풀을 쓰므로 체크아웃은
+    둘 다 세고, 대기 시간은 요청(get_db)에서만 잰다.
+    """
+
+    def __init__(self, engine: Engine):
+        self.pool = engine.pool
+        self.checkouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.pool.checkedout())
+        self.peak_overflow = max(self.peak_overflow, self.pool.overflow())
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def observe_wait(self, started_at: float):
+        waited = time.perf_counter() - started_at
+        self.waits += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.pool.size(),
+            "checked_in": self.pool.checkedin(),
+            "checked_out": self.pool.checkedout(),
+            "overflow": self.pool.overflow(),
+            "peak_checked_out": self.peak_checked_out,
+            "peak_overflow": self.peak_overflow,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "avg_wait_seconds": self.wait_seconds / self.waits if self.waits else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
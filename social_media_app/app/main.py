@@ -1,11 +1,68 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
 
+from app.activity.tasks import activity_maintenance
 from app.api import router
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.hashing import password_hasher
+from app.media.worker import media_worker
+from app.metrics.router import router as metrics_router
+from app.post.like_buffer import like_buffer
+from app.post.tasks import likes_reconciler
+from app.profile.graph import follow_graph
+from app.profile.tasks import follow_graph_refresher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 요청을 받기 전에 팔로우 그래프를 적재, 적재 중의 follow가 빠지지 않도록
+    if settings.FOLLOW_GRAPH_ENABLED:
+        async with SessionLocal() as db:
+            await follow_graph.rebuild(db, settings.FOLLOW_GRAPH_LOAD_BATCH)
+
+    tasks = []
+    if settings.LIKES_RECONCILE_INTERVAL > 0:
+        tasks.append(asyncio.create_task(likes_reconciler()))
+    like_task = None
+    if settings.LIKE_WRITE_BEHIND:
+        like_task = asyncio.create_task(like_buffer.run())
+    if settings.MEDIA_WORKERS > 0:
+        tasks.append(asyncio.create_task(media_worker.run()))
+    if settings.ACTIVITY_MAINTENANCE_INTERVAL > 0:
+        tasks.append(asyncio.create_task(activity_maintenance()))
+    if settings.FOLLOW_GRAPH_ENABLED and settings.FOLLOW_GRAPH_REBUILD_INTERVAL > 0:
+        tasks.append(asyncio.create_task(follow_graph_refresher()))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # 좋아요 루프는 취소하지 않고 멈춘 뒤, 버퍼에 남은 좋아요를 반영
+    like_buffer.stop()
+    if like_task is not None:
+        await like_task
+    await like_buffer.flush()
+    password_hasher.shutdown()
+    media_worker.shutdown()
+
 
 app = FastAPI(
     title="Social Media App",
     description="Engine Behind Social Media App",
     version="0.1",
+    lifespan=lifespan,
 )
 
 app.include_router(router)
+app.include_router(metrics_router)
+app.mount(
+    settings.MEDIA_URL_PREFIX,
+    StaticFiles(directory=settings.MEDIA_VARIANT_DIR, check_dir=False),
+    name="media",
+)
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+)
+
+from app.core.db import Base
+
+
+class MediaJob(Base):
+    __tablename__ = "media_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Post.image / User.profile_pic 에 저장된 원본 경로, 같은 원본은 한 번만 처리
+    source = Column(String, unique=True, nullable=False)
+    # 등록 시점 원본의 mtime(ns), 같은 경로에 파일을 덮어쓰면 달라져 다시 처리한다
+    source_mtime = Column(BigInteger)
+    content_hash = Column(String(64), index=True)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String)
+    next_attempt_dt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_dt = Column(DateTime, default=datetime.utcnow)
+    updated_dt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_media_jobs_status_next_attempt_dt", "status", "next_attempt_dt"),
+    )
+
+
+class MediaVariant(Base):
+    __tablename__ = "media_variants"
+
+    # 내용 해시 기준이라 같은 이미지를 여러 경로로 올려도 변환은 한 번
+    content_hash = Column(String(64), nullable=False)
+    name = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    format = Column(String, nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+
+    __table_args__ = (PrimaryKeyConstraint("content_hash", "name"),)
@@ -0,0 +1,64 @@
+import hashlib
+import os
+import tempfile
+
+from PIL import Image, ImageOps
+
+# 프로세스 풀에서 실행되므로 app 설정이나 DB에 의존하지 않는다
+VARIANTS = {
+    "thumb": {"size": (150, 150), "crop": True, "format": "JPEG", "ext": "jpg"},
+    "medium": {"size": (1080, 1080), "crop": False, "format": "JPEG", "ext": "jpg"},
+    "webp": {"size": (1080, 1080), "crop": False, "format": "WEBP", "ext": "webp"},
+}
+
+
+def file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _save(image: Image.Image, path: str, image_format: str):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".variant-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, format=image_format, quality=85, optimize=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_variants(source_path: str, output_dir: str) -> tuple[str, list[dict]]:
+    """원본 이미지의 해시와 변환본 목록 반환, 이미 있는 변환본은 다시 만들지 않는다"""
+    content_hash = file_sha256(source_path)
+    relative_dir = os.path.join(content_hash[:2], content_hash)
+    os.makedirs(os.path.join(output_dir, relative_dir), exist_ok=True)
+
+    variants = []
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        for name, spec in VARIANTS.items():
+            if spec["crop"]:
+                variant = ImageOps.fit(image, spec["size"])
+            else:
+                variant = image.copy()
+                variant.thumbnail(spec["size"])
+            if spec["format"] == "JPEG" and variant.mode != "RGB":
+                variant = variant.convert("RGB")
+
+            relative_path = os.path.join(relative_dir, f"{name}.{spec['ext']}")
+            path = os.path.join(output_dir, relative_path)
+            if not os.path.exists(path):
+                _save(variant, path, spec["format"])
+
+            variants.append(
+                {
+                    "name": name,
+                    "path": relative_path,
+                    "format": spec["format"].lower(),
+                    "width": variant.width,
+                    "height": variant.height,
+                }
+            )
+
+    return content_hash, variants
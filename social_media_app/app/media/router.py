@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_db
+from app.media.schemas import MediaStatus
+from app.media.service import get_media_status_svc
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+
+@router.get("/variants", response_model=MediaStatus)
+async def get_media_variants(source: str, db: AsyncSession = Depends(get_db)):
+    media = await get_media_status_svc(db, source)
+    if not media:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="media not found"
+        )
+    return media
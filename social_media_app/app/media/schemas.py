@@ -0,0 +1,21 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class MediaVariant(BaseModel):
+    name: str
+    url: str
+    format: str
+    width: int
+    height: int
+
+    class Config:
+        from_attributes = True
+
+
+class MediaStatus(BaseModel):
+    source: str
+    status: str
+    content_hash: Optional[str] = None
+    variants: list[MediaVariant] = []
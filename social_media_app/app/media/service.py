@@ -0,0 +1,170 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.media.models import MediaJob, MediaVariant
+from app.media.schemas import MediaStatus
+
+
+def resolve_source(source: str) -> str:
+    # MEDIA_ROOT 밖의 경로나 원격 URL은 처리하지 않는다
+    if "://" in source:
+        raise ValueError(f"unsupported media source: {source}")
+    root = os.path.realpath(settings.MEDIA_ROOT)
+    path = os.path.realpath(os.path.join(root, source.lstrip("/")))
+    if not path.startswith(root + os.sep):
+        raise ValueError(f"media source outside MEDIA_ROOT: {source}")
+    return path
+
+
+def source_mtime(source: str) -> Optional[int]:
+    try:
+        return os.stat(resolve_source(source)).st_mtime_ns
+    except (ValueError, OSError):
+        return None
+
+
+async def enqueue_media_svc(db: AsyncSession, source: Optional[str]):
+    # 같은 원본은 source unique 제약으로 한 번만 등록, commit은 호출한 쪽에서
+    if not source:
+        return
+    mtime = await asyncio.to_thread(source_mtime, source)
+    stmt = insert(MediaJob).values(
+        source=source,
+        source_mtime=mtime,
+        status="pending",
+        next_attempt_dt=datetime.utcnow(),
+    )
+    # 같은 경로라도 파일이 바뀌었으면 작업을 처음부터 다시 돌린다
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[MediaJob.source],
+            set_={
+                "source_mtime": stmt.excluded.source_mtime,
+                "status": "pending",
+                "attempts": 0,
+                "last_error": None,
+                "next_attempt_dt": stmt.excluded.next_attempt_dt,
+            },
+            where=stmt.excluded.source_mtime.is_not(None)
+            & MediaJob.source_mtime.is_distinct_from(stmt.excluded.source_mtime),
+        )
+    )
+
+
+def thumbnail_url(source_column, variant: str = "thumb"):
+    # 피드/팔로워 목록 쿼리에 붙이는 작은 변환본 URL 서브쿼리
+    return (
+        select(MediaVariant.url)
+        .join(MediaJob, MediaJob.content_hash == MediaVariant.content_hash)
+        .where(MediaJob.source == source_column, MediaVariant.name == variant)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+async def get_media_status_svc(db: AsyncSession, source: str) -> Optional[MediaStatus]:
+    job = await db.scalar(select(MediaJob).where(MediaJob.source == source))
+    if not job:
+        return None
+
+    variants = []
+    if job.content_hash:
+        result = await db.execute(
+            select(MediaVariant).where(MediaVariant.content_hash == job.content_hash)
+        )
+        variants = result.scalars().all()
+
+    return MediaStatus(
+        source=job.source,
+        status=job.status,
+        content_hash=job.content_hash,
+        variants=variants,
+    )
+
+
+async def requeue_stale_jobs_svc(db: AsyncSession) -> int:
+    # 처리 중에 죽은 워커가 잡고 있던 작업을 되돌린다
+    deadline = datetime.utcnow() - timedelta(seconds=settings.MEDIA_JOB_TIMEOUT)
+    result = await db.execute(
+        update(MediaJob)
+        .where(MediaJob.status == "running", MediaJob.updated_dt < deadline)
+        .values(status="pending", updated_dt=datetime.utcnow())
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def claim_jobs_svc(db: AsyncSession, limit: int) -> list[tuple[int, str]]:
+    result = await db.execute(
+        select(MediaJob)
+        .where(
+            MediaJob.status == "pending",
+            MediaJob.next_attempt_dt <= datetime.utcnow(),
+        )
+        .order_by(MediaJob.next_attempt_dt)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    jobs = result.scalars().all()
+    for job in jobs:
+        job.status = "running"
+        job.attempts += 1
+    await db.commit()
+    return [(job.id, job.source) for job in jobs]
+
+
+async def complete_job_svc(
+    db: AsyncSession, job_id: int, content_hash: str, variants: list[dict]
+):
+    # (content_hash, name) PK라 재시도나 같은 내용의 다른 원본이 와도 한 번만 저장
+    await db.execute(
+        insert(MediaVariant)
+        .values(
+            [
+                {
+                    "content_hash": content_hash,
+                    "name": variant["name"],
+                    "url": f"{settings.MEDIA_URL_PREFIX}/{variant['path']}",
+                    "format": variant["format"],
+                    "width": variant["width"],
+                    "height": variant["height"],
+                }
+                for variant in variants
+            ]
+        )
+        .on_conflict_do_nothing(
+            index_elements=[MediaVariant.content_hash, MediaVariant.name]
+        )
+    )
+    # 처리 중에 원본이 바뀌어 다시 pending이 된 작업은 그대로 둔다
+    await db.execute(
+        update(MediaJob)
+        .where(MediaJob.id == job_id, MediaJob.status == "running")
+        .values(status="done", content_hash=content_hash, last_error=None)
+    )
+    await db.commit()
+
+
+async def fail_job_svc(
+    db: AsyncSession, job_id: int, error: str, permanent: bool = False
+):
+    job = await db.get(MediaJob, job_id)
+    if not job or job.status != "running":
+        return
+
+    job.last_error = error[:1000]
+    if permanent or job.attempts >= settings.MEDIA_MAX_ATTEMPTS:
+        job.status = "failed"
+    else:
+        # 지수 백오프로 재시도
+        delay = settings.MEDIA_RETRY_BACKOFF * 2 ** (job.attempts - 1)
+        job.status = "pending"
+        job.next_attempt_dt = datetime.utcnow() + timedelta(seconds=delay)
+    await db.commit()
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.media.processing import render_variants
+from app.media.service import (
+    claim_jobs_svc,
+    complete_job_svc,
+    fail_job_svc,
+    requeue_stale_jobs_svc,
+    resolve_source,
+)
+
+logger = logging.getLogger(__name__)
+
+# 다시 시도해도 결과가 같은 실패 (허용되지 않는 경로, 지원하지 않거나 너무 큰 이미지)
+PERMANENT_ERRORS = (ValueError, UnidentifiedImageError, Image.DecompressionBombError)
+
+
+class MediaWorker:
+    """media_jobs를 가져와 프로세스 풀에서 변환본을 만든다"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def notify(self):
+        self._wakeup.set()
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        # 깨진 풀은 다시 쓸 수 없으니 버리고 다음 제출 때 새로 만든다
+        if self._executor is executor:
+            self.shutdown()
+
+    async def _process(self, job_id: int, source: str, isolated: bool = False) -> bool:
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            content_hash, variants = await loop.run_in_executor(
+                executor,
+                render_variants,
+                resolve_source(source),
+                settings.MEDIA_VARIANT_DIR,
+            )
+        except BrokenProcessPool as exc:
+            self._discard_executor(executor)
+            if not isolated:
+                # 같은 배치의 어느 작업이 풀을 깨뜨렸는지 모르므로 나중에 하나씩 다시 돌린다
+                return False
+            logger.warning("media job %d crashed the worker process", job_id)
+            async with SessionLocal() as db:
+                await fail_job_svc(db, job_id, repr(exc), permanent=True)
+            return True
+        except Exception as exc:
+            logger.warning("media job %d failed: %r", job_id, exc)
+            async with SessionLocal() as db:
+                await fail_job_svc(
+                    db, job_id, repr(exc), isinstance(exc, PERMANENT_ERRORS)
+                )
+            return True
+
+        async with SessionLocal() as db:
+            await complete_job_svc(db, job_id, content_hash, variants)
+        return True
+
+    async def run_once(self) -> int:
+        async with SessionLocal() as db:
+            await requeue_stale_jobs_svc(db)
+            jobs = await claim_jobs_svc(db, self.workers * 2)
+
+        processed = await asyncio.gather(
+            *(self._process(job_id, source) for job_id, source in jobs)
+        )
+        # 풀이 깨졌던 작업은 혼자 돌려서 다시 깨뜨린 작업만 실패로 남긴다
+        for (job_id, source), done in zip(jobs, processed):
+            if not done:
+                await self._process(job_id, source, isolated=True)
+        return len(jobs)
+
+    async def run(self):
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("media worker iteration failed")
+                processed = 0
+
+            # 처리할 작업이 남아 있으면 바로 다음 배치
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=settings.MEDIA_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+media_worker = MediaWorker(settings.MEDIA_WORKERS)
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+
+from app.auth.cache import user_cache
+from app.core.db import pool_stats
+from app.core.hashing import password_hasher
+from app.profile.graph import follow_graph
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/db-pool")
+async def db_pool_metrics():
+    return pool_stats.stats()
+
+
+@router.get("/auth-cache")
+async def auth_cache_metrics():
+    return user_cache.stats()
+
+
+@router.get("/password-hasher")
+async def password_hasher_metrics():
+    return password_hasher.stats()
+
+
+@router.get("/follow-graph")
+async def follow_graph_metrics():
+    return follow_graph.stats()
@@ -0,0 +1,213 @@
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import case, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.activity.models import Activity
+from app.activity.service import record_activity_groups_svc
+from app.auth.models import User
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.post.models import Post, post_likes
+from app.post.schemas import Post as PostSchema
+
+logger = logging.getLogger(__name__)
+
+# asyncpg는 한 문장에 바인드 파라미터를 32767개까지만 받으므로 나눠서 보낸다
+WRITE_CHUNK = 1000
+
+
+def _chunks(values: list) -> Iterator[list]:
+    for start in range(0, len(values), WRITE_CHUNK):
+        yield values[start : start + WRITE_CHUNK]
+
+
+@dataclass
+class PendingLike:
+    liked: bool
+    activity: Optional[dict] = None
+
+
+class LikeBuffer:
+    """좋아요/좋아요 취소를 모아 두었다가 주기적으로 한 번에 반영"""
+
+    def __init__(self, flush_interval_ms: int, max_events: int):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_events = max_events
+        # (user_id, post_id) -> 아직 DB에 반영되지 않은 최종 상태
+        self.pending: dict[tuple[int, int], PendingLike] = {}
+        # post_id -> 아직 반영되지 않은 likes_count 변화량
+        self.deltas: dict[int, int] = defaultdict(int)
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def state(self, user_id: int, post_id: int) -> Optional[bool]:
+        entry = self.pending.get((user_id, post_id))
+        return entry.liked if entry else None
+
+    def delta(self, post_id: int) -> int:
+        return self.deltas.get(post_id, 0)
+
+    def like(self, user_id: int, post_id: int, activity: dict) -> bool:
+        return self._record(user_id, post_id, PendingLike(True, activity))
+
+    def unlike(self, user_id: int, post_id: int) -> bool:
+        return self._record(user_id, post_id, PendingLike(False))
+
+    def _record(self, user_id: int, post_id: int, entry: PendingLike) -> bool:
+        key = (user_id, post_id)
+        current = self.pending.get(key)
+        if current is not None and current.liked == entry.liked:
+            return False
+
+        # 반대 동작이 대기 중이면 서로 상쇄
+        if current is not None:
+            del self.pending[key]
+        else:
+            self.pending[key] = entry
+        self.deltas[post_id] += 1 if entry.liked else -1
+
+        if len(self.pending) >= self.max_events:
+            self._wakeup.set()
+        return True
+
+    def _restore(self, batch: dict[tuple[int, int], PendingLike]):
+        # deltas는 커밋 전까지 그대로 두므로 pending만 되돌린다
+        for key, entry in batch.items():
+            current = self.pending.get(key)
+            if current is None:
+                self.pending[key] = entry
+            elif current.liked != entry.liked:
+                del self.pending[key]
+
+    def _settle(self, batch: dict[tuple[int, int], PendingLike]):
+        # 커밋된 배치의 변화량은 이제 DB의 likes_count에 들어 있다
+        for (_, post_id), entry in batch.items():
+            self.deltas[post_id] -= 1 if entry.liked else -1
+            if not self.deltas[post_id]:
+                del self.deltas[post_id]
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self.pending:
+                return
+
+            batch, self.pending = self.pending, {}
+            try:
+                await self._write(batch)
+                self._settle(batch)
+            except Exception:
+                logger.exception("failed to flush %d buffered likes", len(batch))
+                self._restore(batch)
+            except BaseException:
+                # 종료 중 취소되어도 꺼낸 배치를 돌려놓아 마지막 flush에서 반영
+                self._restore(batch)
+                raise
+
+    async def _write(self, batch: dict[tuple[int, int], PendingLike]):
+        likes = [key for key, entry in batch.items() if entry.liked]
+        unlikes = [key for key, entry in batch.items() if not entry.liked]
+        deltas = defaultdict(int)
+
+        async with SessionLocal() as db:
+            # 실제로 반영된 행만 카운터에 더해 중복 반영을 막는다
+            for chunk in _chunks(likes):
+                chunk = await self._existing(db, chunk)
+                if not chunk:
+                    continue
+                result = await db.execute(
+                    pg_insert(post_likes)
+                    .values([{"user_id": u, "post_id": p} for u, p in chunk])
+                    .on_conflict_do_nothing()
+                    .returning(post_likes.c.user_id, post_likes.c.post_id)
+                )
+                inserted = result.all()
+                for _, post_id in inserted:
+                    deltas[post_id] += 1
+
+                activities = [batch[tuple(key)].activity for key in inserted]
+                if activities:
+                    await db.execute(insert(Activity), activities)
+                    await record_activity_groups_svc(db, activities)
+
+            for chunk in _chunks(unlikes):
+                result = await db.execute(
+                    delete(post_likes)
+                    .where(
+                        tuple_(post_likes.c.user_id, post_likes.c.post_id).in_(chunk)
+                    )
+                    .returning(post_likes.c.post_id)
+                )
+                for post_id in result.scalars():
+                    deltas[post_id] -= 1
+
+            changed = [(post_id, n) for post_id, n in deltas.items() if n]
+            for chunk in _chunks(changed):
+                chunk = dict(chunk)
+                await db.execute(
+                    update(Post)
+                    .where(Post.id.in_(chunk))
+                    .values(
+                        likes_count=func.coalesce(Post.likes_count, 0)
+                        + case(chunk, value=Post.id)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+
+            await db.commit()
+
+    async def _existing(
+        self, db: AsyncSession, likes: list[tuple[int, int]]
+    ) -> list[tuple[int, int]]:
+        # 버퍼에 있는 동안 게시물이나 사용자가 지워졌으면 FK 오류로 배치 전체가 막히므로
+        # 남아 있는 것만 넣고, 커밋까지 삭제되지 않도록 FOR KEY SHARE로 잡아 둔다
+        post_ids = await db.scalars(
+            select(Post.id)
+            .where(Post.id.in_({post_id for _, post_id in likes}))
+            .with_for_update(key_share=True)
+        )
+        user_ids = await db.scalars(
+            select(User.id)
+            .where(User.id.in_({user_id for user_id, _ in likes}))
+            .with_for_update(key_share=True)
+        )
+        post_ids, user_ids = set(post_ids), set(user_ids)
+
+        existing = [(u, p) for u, p in likes if u in user_ids and p in post_ids]
+        if len(existing) < len(likes):
+            logger.info(
+                "dropped %d buffered likes for deleted posts or users",
+                len(likes) - len(existing),
+            )
+        return existing
+
+    async def run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def stop(self):
+        # 취소하지 않고 진행 중인 flush가 끝난 뒤 루프를 빠져나오게 한다
+        self._stopping = True
+        self._wakeup.set()
+
+
+like_buffer = LikeBuffer(
+    settings.LIKE_FLUSH_INTERVAL_MS, settings.LIKE_FLUSH_MAX_EVENTS
+)
+
+
+def post_with_pending_likes(post: Post) -> PostSchema:
+    post_data = PostSchema.model_validate(post, from_attributes=True)
+    post_data.likes_count = (post_data.likes_count or 0) + like_buffer.delta(post.id)
+    return post_data
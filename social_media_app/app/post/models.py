@@ -1,6 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    false,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -15,8 +25,9 @@ post_hashtags = Table(
 post_likes = Table(
     "post_likes",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id")),
-    Column("post_id", Integer, ForeignKey("posts.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("post_id", Integer, ForeignKey("posts.id"), primary_key=True),
+    Index("ix_post_likes_post_id", "post_id"),
 )
 
 
@@ -29,6 +40,10 @@ class Post(Base):
     location = Column(String)
     created_dt = Column(DateTime, default=datetime.now)
     likes_count = Column(Integer, default=0)
+    # 작성 당시 팔로워에게 전파하지 않고 읽을 때 합치는 게시물
+    timeline_pull = Column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
 
     author_id = Column(Integer, ForeignKey("users.id"))
     author = relationship("User", back_populates="posts")
@@ -38,11 +53,22 @@ class Post(Base):
         "User", secondary=post_likes, back_populates="liked_posts"
     )
 
+    # 작성자별 최신 게시물 조회 (타임라인 fan-out-on-read)
+    __table_args__ = (
+        Index("ix_posts_author_id_id", "author_id", "id"),
+        Index(
+            "ix_posts_author_id_id_pull",
+            "author_id",
+            "id",
+            postgresql_where=timeline_pull,
+        ),
+    )
+
 
 class Hashtag(Base):
     __tablename__ = "hashtags"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String, unique=True, index=True)
 
     posts = relationship("Post", secondary=post_hashtags, back_populates="hashtags")
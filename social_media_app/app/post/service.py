@@ -1,38 +1,74 @@
 import re
+from datetime import datetime
 from typing import List
 
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, desc, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.activity.models import Activity
+from app.activity.service import record_activity_groups_svc
 from app.auth.models import User
-from app.post.models import Hashtag, Post, post_hashtags
+from app.core.config import settings
+from app.media.service import enqueue_media_svc, thumbnail_url
+from app.media.worker import media_worker
+from app.post.like_buffer import like_buffer, post_with_pending_likes
+from app.post.models import Hashtag, Post, post_hashtags, post_likes
 from app.post.schemas import Post as PostSchema
 from app.post.schemas import PostCreate
+from app.timeline.service import fan_out_post_svc
+from app.timeline.store import timeline_store
 
 
-async def get_posts_by_username(username: str, db: Session) -> List[Post]:
-    return db.query(Post).filter(Post.author.has(username=username)).all()
+async def get_posts_by_username(username: str, db: AsyncSession) -> List[PostSchema]:
+    result = await db.execute(
+        select(Post)
+        .options(selectinload(Post.hashtags))
+        .where(Post.author.has(username=username))
+    )
+    return [post_with_pending_likes(post) for post in result.scalars()]
 
 
-async def create_hashtags_svc(post: Post, db: Session):
+async def create_hashtags_svc(post: Post, db: AsyncSession):
     regex = r"#\w+"
-    matches = re.findall(regex, post.content)
-
-    for match in matches:
-        name = match[1:]
-
-        hashtag = db.query(Hashtag).filter(Hashtag.name == name).first()
-        if not hashtag:
-            hashtag = Hashtag(name=name)
-            db.add(hashtag)
-            db.commit()
-        post.hashtags.append(hashtag)
+    # 순서를 유지하면서 중복 제거
+    names = list(dict.fromkeys(match[1:] for match in re.findall(regex, post.content)))
+    if not names:
+        return
 
-    db.commit()
+    result = await db.execute(
+        select(Hashtag.name, Hashtag.id).where(Hashtag.name.in_(names))
+    )
+    hashtag_ids = dict(result.all())
+
+    missing = [name for name in names if name not in hashtag_ids]
+    if missing:
+        result = await db.execute(
+            insert(Hashtag)
+            .values([{"name": name} for name in missing])
+            .on_conflict_do_nothing(index_elements=[Hashtag.name])
+            .returning(Hashtag.name, Hashtag.id)
+        )
+        hashtag_ids.update(result.all())
+
+        # 동시에 다른 요청이 만든 태그는 RETURNING에 포함되지 않는다
+        missing = [name for name in missing if name not in hashtag_ids]
+        if missing:
+            result = await db.execute(
+                select(Hashtag.name, Hashtag.id).where(Hashtag.name.in_(missing))
+            )
+            hashtag_ids.update(result.all())
+
+    await db.execute(
+        insert(post_hashtags),
+        [{"post_id": post.id, "hashtag_id": hashtag_ids[name]} for name in names],
+    )
 
 
-async def create_post_svc(post: PostCreate, user_id: int, db: Session):
+async def create_post_svc(
+    post: PostCreate, user_id: int, followers_count: int, db: AsyncSession
+):
     db_post = Post(
         content=post.content,
         image=post.image,
@@ -40,122 +76,242 @@ async def create_post_svc(post: PostCreate, user_id: int, db: Session):
         author_id=user_id,
     )
 
-    await create_hashtags_svc(db_post, db)
-
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
+    await db.flush()
 
-    return db_post
+    if db_post.content:
+        await create_hashtags_svc(db_post, db)
 
+    await enqueue_media_svc(db, db_post.image)
+    await db.commit()
+    media_worker.notify()
 
-async def get_users_posts_svc(user_id: int, db: Session) -> list[PostSchema]:
-    posts = (
-        db.query(Post)
-        .filter(Post.author_id == user_id)
+    await fan_out_post_svc(db, db_post, followers_count)
+
+    return await get_post_from_post_id_svc(db_post.id, db)
+
+
+async def get_users_posts_svc(user_id: int, db: AsyncSession) -> list[PostSchema]:
+    result = await db.execute(
+        select(Post)
+        .options(selectinload(Post.hashtags))
+        .where(Post.author_id == user_id)
         .order_by(desc(Post.created_dt))
-        .all()
     )
 
-    return posts
+    return [post_with_pending_likes(post) for post in result.scalars()]
 
 
-async def get_posts_from_hashtag_svc(hashtag_name: str, db: Session):
-    hashtag = db.query(Hashtag).filter(Hashtag.name == hashtag_name).first()
+async def get_posts_from_hashtag_svc(hashtag_name: str, db: AsyncSession):
+    result = await db.execute(select(Hashtag).where(Hashtag.name == hashtag_name))
+    hashtag = result.scalars().first()
     if not hashtag:
         return None
-    return hashtag.posts
+
+    result = await db.execute(
+        select(Post)
+        .join(Post.hashtags)
+        .options(selectinload(Post.hashtags))
+        .where(Hashtag.id == hashtag.id)
+    )
+    return [post_with_pending_likes(post) for post in result.scalars()]
 
 
 async def get_random_posts_svc(
-    db: Session, page: int = 1, limit: int = 10, hashtag: str = None
+    db: AsyncSession, page: int = 1, limit: int = 10, hashtag: str = None
 ):
-    total_posts = db.query(Post).count()
+    total_posts = await db.scalar(select(func.count(Post.id)))
 
     offset = (page - 1) * limit
     if offset >= total_posts:
         return []
 
-    posts = db.query(Post, User.username).join(User).order_by(desc(Post.created_dt))
+    posts = (
+        select(Post, User.username, thumbnail_url(Post.image).label("image_thumb"))
+        .join(User, Post.author_id == User.id)
+        .order_by(desc(Post.created_dt))
+    )
 
     if hashtag:
-        posts = posts.join(post_hashtags).join(Hashtag).filter(Hashtag.name == hashtag)
+        posts = posts.join(post_hashtags).join(Hashtag).where(Hashtag.name == hashtag)
 
-    posts = posts.offset(offset).limit(limit).all()
+    result = await db.execute(posts.offset(offset).limit(limit))
 
-    result = []
-    for post, username in posts:
-        post_dict = post.__dict__
+    result_list = []
+    for post, username, image_thumb in result.all():
+        post_dict = dict(post.__dict__)
+        # 타임라인 전파 방식은 내부 값이라 응답에 넣지 않는다
+        post_dict.pop("timeline_pull", None)
         post_dict["username"] = username
-        result.append(post_dict)
+        post_dict["image_thumb"] = image_thumb
+        post_dict["likes_count"] = (post.likes_count or 0) + like_buffer.delta(post.id)
+        result_list.append(post_dict)
 
-    return result
+    return result_list
 
 
-async def get_post_from_post_id_svc(post_id: int, db: Session) -> PostSchema:
-    return db.query(Post).filter(Post.id == post_id).first()
+async def get_post_from_post_id_svc(post_id: int, db: AsyncSession) -> PostSchema:
+    result = await db.execute(
+        select(Post).options(selectinload(Post.hashtags)).where(Post.id == post_id)
+    )
+    return result.scalars().first()
 
 
-async def delete_post_svc(post_id: int, db: Session):
+async def delete_post_svc(post_id: int, db: AsyncSession):
     post = await get_post_from_post_id_svc(post_id, db)
-    db.delete(post)
-    db.commit()
+    await timeline_store.remove(db, post_id)
+    await db.delete(post)
+    await db.commit()
 
 
-async def like_post_svc(post_id: int, username: str, db: Session):
-    post = await get_post_from_post_id_svc(post_id, db)
+async def get_post_like_target(post_id: int, db: AsyncSession):
+    result = await db.execute(
+        select(Post.id, Post.image, User.username)
+        .join(User, Post.author_id == User.id)
+        .where(Post.id == post_id)
+    )
+    return result.first()
+
+
+async def is_liked(db: AsyncSession, user_id: int, post_id: int) -> bool:
+    # 버퍼에 대기 중인 상태가 DB 상태보다 우선
+    pending = like_buffer.state(user_id, post_id)
+    if pending is not None:
+        return pending
+
+    return await db.scalar(
+        select(
+            exists().where(
+                post_likes.c.user_id == user_id, post_likes.c.post_id == post_id
+            )
+        )
+    )
+
+
+async def like_post_svc(post_id: int, username: str, db: AsyncSession):
+    post = await get_post_like_target(post_id, db)
 
     if not post:
         return False, "Invalid post_id"
 
-    user = db.query(User).filter(User.username == username).first()
+    user_id = await db.scalar(select(User.id).where(User.username == username))
 
-    if not user:
+    if not user_id:
         return False, "Invalid username"
 
-    if user in post.like_by_users:
+    if settings.LIKE_WRITE_BEHIND:
+        if await is_liked(db, user_id, post_id):
+            return False, "Already Liked"
+
+        activity = {
+            "timestamp": datetime.utcnow(),
+            "username": post.username,
+            "liked_post_id": post_id,
+            "username_like": username,
+            "liked_post_image": post.image,
+        }
+        if not like_buffer.like(user_id, post_id, activity):
+            return False, "Already Liked"
+        return True, "done"
+
+    # (user_id, post_id) PK로 중복 좋아요를 막는다
+    result = await db.execute(
+        insert(post_likes)
+        .values(user_id=user_id, post_id=post_id)
+        .on_conflict_do_nothing()
+        .returning(post_likes.c.post_id)
+    )
+    if result.first() is None:
         return False, "Already Liked"
 
-    post.like_by_users.append(user)
-    post.likes_count = len(post.like_by_users)
-
-    like_activity = Activity(
-        username=post.author.username,
-        liked_post_id=post_id,
-        username_like=username,
-        liked_post_image=post.image,
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(likes_count=func.coalesce(Post.likes_count, 0) + 1)
     )
 
-    db.add(like_activity)
+    like_activity = {
+        "username": post.username,
+        "liked_post_id": post_id,
+        "username_like": username,
+        "liked_post_image": post.image,
+    }
 
-    db.commit()
+    db.add(Activity(**like_activity))
+    await record_activity_groups_svc(db, [like_activity])
+
+    await db.commit()
     return True, "done"
 
 
-async def unlike_post_svc(post_id: int, username: str, db: Session):
-    post = await get_post_from_post_id_svc(post_id, db)
+async def unlike_post_svc(post_id: int, username: str, db: AsyncSession):
+    post = await get_post_like_target(post_id, db)
 
     if not post:
         return False, "Invalid post_id"
 
-    user = db.query(User).filter(User.username == username).first()
+    user_id = await db.scalar(select(User.id).where(User.username == username))
 
-    if not user:
+    if not user_id:
         return False, "Invalid username"
 
-    if not user in post.like_by_users:
+    if settings.LIKE_WRITE_BEHIND:
+        if not await is_liked(db, user_id, post_id) or not like_buffer.unlike(
+            user_id, post_id
+        ):
+            return False, "Already Not Liked"
+        return True, "done"
+
+    result = await db.execute(
+        delete(post_likes)
+        .where(post_likes.c.user_id == user_id, post_likes.c.post_id == post_id)
+        .returning(post_likes.c.post_id)
+    )
+    if result.first() is None:
         return False, "Already Not Liked"
 
-    post.like_by_users.remove(user)
-    post.likes_count = len(post.like_by_users)
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(likes_count=func.coalesce(Post.likes_count, 0) - 1)
+    )
 
-    db.commit()
+    await db.commit()
+    return True, "done"
 
 
-async def liked_users_post_svc(post_id: int, db: Session) -> List[User]:
-    post = await get_post_from_post_id_svc(post_id, db)
+async def liked_users_post_svc(post_id: int, db: AsyncSession) -> List[User]:
+    result = await db.execute(
+        select(User)
+        .join(post_likes, post_likes.c.user_id == User.id)
+        .where(post_likes.c.post_id == post_id)
+    )
+    return result.scalars().all()
 
-    if not post:
-        return []
-    liked_users = post.like_by_users
-    return liked_users
+
+async def reconcile_likes_count_svc(db: AsyncSession, batch_size: int = 1000) -> int:
+    # post_likes 기준으로 likes_count 드리프트를 id 구간별로 보정
+    actual = (
+        select(func.count())
+        .select_from(post_likes)
+        .where(post_likes.c.post_id == Post.id)
+        .scalar_subquery()
+    )
+    max_id = await db.scalar(select(func.max(Post.id))) or 0
+
+    fixed = 0
+    for start in range(0, max_id, batch_size):
+        result = await db.execute(
+            update(Post)
+            .where(
+                Post.id > start,
+                Post.id <= start + batch_size,
+                Post.likes_count.is_distinct_from(actual),
+            )
+            .values(likes_count=actual)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        fixed += result.rowcount
+
+    return fixed
@@ -0,0 +1,20 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.post.service import reconcile_likes_count_svc
+
+logger = logging.getLogger(__name__)
+
+
+async def likes_reconciler():
+    while True:
+        await asyncio.sleep(settings.LIKES_RECONCILE_INTERVAL)
+        try:
+            async with SessionLocal() as db:
+                fixed = await reconcile_likes_count_svc(db)
+            if fixed:
+                logger.info("reconciled likes_count for %d posts", fixed)
+        except Exception:
+            logger.exception("likes_count reconciliation failed")
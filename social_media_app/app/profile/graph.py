@@ -0,0 +1,153 @@
+import bisect
+import random
+from array import array
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import Follow
+
+_EMPTY = array("q")
+
+
+def _insert(values: array, value: int) -> bool:
+    index = bisect.bisect_left(values, value)
+    if index < len(values) and values[index] == value:
+        return False
+    values.insert(index, value)
+    return True
+
+
+def _remove(values: array, value: int) -> bool:
+    index = bisect.bisect_left(values, value)
+    if index < len(values) and values[index] == value:
+        del values[index]
+        return True
+    return False
+
+
+def _contains(values: array, value: int) -> bool:
+    index = bisect.bisect_left(values, value)
+    return index < len(values) and values[index] == value
+
+
+def intersect(a: array, b: array) -> list[int]:
+    # 작은 쪽을 순회하면서 큰 쪽을 이진 탐색, 탐색 시작점은 계속 앞으로만 이동
+    if len(a) > len(b):
+        a, b = b, a
+    result = []
+    lo = 0
+    for value in a:
+        lo = bisect.bisect_left(b, value, lo)
+        if lo == len(b):
+            break
+        if b[lo] == value:
+            result.append(value)
+    return result
+
+
+class FollowGraph:
+    """사용자별 팔로워/팔로잉 id를 정렬된 정수 배열로 들고 있는 인메모리 인덱스
+
+    원본은 follows 테이블이다. 이 프로세스에서 커밋된 follow/unfollow는 바로
+    증분으로 반영하고, 다른 워커 프로세스의 변경은 주기적인 rebuild로 들어온다.
+    그래서 다른 워커에서 생긴 변경은 최대 FOLLOW_GRAPH_REBUILD_INTERVAL초와
+    적재 시간만큼 늦게 보일 수 있다.
+    """
+
+    def __init__(self):
+        self._followers: dict[int, array] = {}
+        self._followings: dict[int, array] = {}
+        # rebuild 중에 들어온 증분 변경, 새 배열로 바꾼 뒤 다시 적용한다
+        self._changes: Optional[list[tuple[bool, int, int]]] = None
+        self.ready = False
+
+    def _apply(self, added: bool, follower_id: int, following_id: int):
+        if self._changes is not None:
+            self._changes.append((added, follower_id, following_id))
+        if added:
+            _insert(self._followings.setdefault(follower_id, array("q")), following_id)
+            _insert(self._followers.setdefault(following_id, array("q")), follower_id)
+        else:
+            _remove(self._followings.get(follower_id, _EMPTY), following_id)
+            _remove(self._followers.get(following_id, _EMPTY), follower_id)
+
+    def add(self, follower_id: int, following_id: int):
+        # 적재 전(비활성화 포함)에는 갱신하지 않는다, rebuild가 테이블에서 다시 읽는다
+        if self.ready:
+            self._apply(True, follower_id, following_id)
+
+    def remove(self, follower_id: int, following_id: int):
+        if self.ready:
+            self._apply(False, follower_id, following_id)
+
+    def follows(self, follower_id: int, following_id: int) -> bool:
+        return _contains(self._followings.get(follower_id, _EMPTY), following_id)
+
+    def followers(self, user_id: int) -> array:
+        return self._followers.get(user_id, _EMPTY)
+
+    def followings(self, user_id: int) -> array:
+        return self._followings.get(user_id, _EMPTY)
+
+    def mutual_followers(self, viewer_id: int, user_id: int) -> list[int]:
+        # viewer가 팔로우하는 사람 중에서 user를 팔로우하는 사람
+        return intersect(self.followings(viewer_id), self.followers(user_id))
+
+    def suggestions(
+        self, user_id: int, limit: int, fanout: int
+    ) -> list[tuple[int, int]]:
+        # 친구의 친구를 겹치는 친구 수로 정렬, 살펴볼 친구 수는 fanout으로 제한
+        # id가 낮은(오래된) 계정에 치우치지 않도록 fanout보다 많으면 무작위로 고른다
+        followings = self.followings(user_id)
+        sampled = followings
+        if len(followings) > fanout:
+            sampled = random.sample(followings, fanout)
+        counts = Counter()
+        for following_id in sampled:
+            counts.update(self.followings(following_id))
+
+        counts.pop(user_id, None)
+        for following_id in followings:
+            counts.pop(following_id, None)
+        return counts.most_common(limit)
+
+    async def rebuild(self, db: AsyncSession, batch_size: int):
+        # (follower_id, following_id) 순으로 읽으면 두 방향 배열 모두 정렬된 채로 쌓인다
+        followers: dict[int, array] = {}
+        followings: dict[int, array] = {}
+        self._changes = []
+        try:
+            result = await db.stream(
+                select(Follow.follower_id, Follow.following_id)
+                .order_by(Follow.follower_id, Follow.following_id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for rows in result.partitions():
+                for follower_id, following_id in rows:
+                    followings.setdefault(follower_id, array("q")).append(following_id)
+                    followers.setdefault(following_id, array("q")).append(follower_id)
+        finally:
+            changes, self._changes = self._changes, None
+
+        # 읽는 동안 커밋된 변경은 스냅샷에 있을 수도 없을 수도 있다, 다시 적용해도 결과는 같다
+        self._followers = followers
+        self._followings = followings
+        self.ready = True
+        for change in changes:
+            self._apply(*change)
+
+    def stats(self) -> dict:
+        edges = sum(len(values) for values in self._followings.values())
+        return {
+            "ready": self.ready,
+            "users": len(self._followers.keys() | self._followings.keys()),
+            "edges": edges,
+            # 양방향으로 저장하므로 간선당 8바이트 * 2
+            "array_bytes": edges * _EMPTY.itemsize * 2,
+        }
+
+
+follow_graph = FollowGraph()
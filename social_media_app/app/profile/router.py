@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.auth.service import existing_user, get_current_user, get_user_by_username
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.service import (
+    existing_user,
+    get_current_principal,
+    get_current_user,
+    get_user_by_username,
+)
 from app.core.db import get_db
-from app.profile.schemas import FollowerList, FollowingList, Profile
+from app.profile.graph import follow_graph
+from app.profile.schemas import (
+    FollowerList,
+    FollowingList,
+    MutualList,
+    Profile,
+    SuggestionList,
+)
 from app.profile.service import (
     follow_svc,
     get_followers_svc,
     get_followings_svc,
+    get_mutuals_svc,
+    get_suggestions_svc,
     unfollow_svc,
 )
 
@@ -15,7 +31,7 @@ router = APIRouter(prefix="/profile", tags=["profile"])
 
 
 @router.get("/user/{username}", response_model=Profile)
-async def profile(username: str, db: Session = Depends(get_db)):
+async def profile(username: str, db: AsyncSession = Depends(get_db)):
     db_user_exist = await existing_user(username, "", db)
     if not db_user_exist:
         raise HTTPException(
@@ -29,7 +45,7 @@ async def profile(username: str, db: Session = Depends(get_db)):
 
 
 @router.post("/follow/{username}", status_code=status.HTTP_204_NO_CONTENT)
-async def follow(username: str, token: str, db: Session = Depends(get_db)):
+async def follow(username: str, token: str, db: AsyncSession = Depends(get_db)):
     db_user = await get_current_user(token, db)
 
     if not db_user:
@@ -45,7 +61,7 @@ async def follow(username: str, token: str, db: Session = Depends(get_db)):
 
 
 @router.post("/unfollow/{username}", status_code=status.HTTP_204_NO_CONTENT)
-async def unfollow(username: str, token: str, db: Session = Depends(get_db)):
+async def unfollow(username: str, token: str, db: AsyncSession = Depends(get_db)):
     db_user = await get_current_user(token, db)
 
     if not db_user:
@@ -61,21 +77,75 @@ async def unfollow(username: str, token: str, db: Session = Depends(get_db)):
 
 
 @router.get("/followers", response_model=FollowerList)
-async def get_followers(token: str, db: Session = Depends(get_db)):
-    current_user = await get_current_user(token, db)
+async def get_followers(
+    token: str,
+    before: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    current_user = await get_current_principal(token, db)
     if not current_user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token"
         )
-    return await get_followers_svc(db, current_user.id)
+    return await get_followers_svc(db, current_user.id, before, limit)
 
 
 @router.get("/followings", response_model=FollowingList)
-async def get_followings(token: str, db: Session = Depends(get_db)):
-    current_user = await get_current_user(token, db)
+async def get_followings(
+    token: str,
+    before: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    current_user = await get_current_principal(token, db)
+    if not current_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token"
+        )
+    return await get_followings_svc(db, current_user.id, before, limit)
+
+
+@router.get("/suggestions", response_model=SuggestionList)
+async def get_suggestions(
+    token: str,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    current_user = await get_current_principal(token, db)
     if not current_user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token"
         )
-    print(current_user.id)
-    return await get_followings_svc(db, current_user.id)
+    if not follow_graph.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="follow graph is not loaded",
+        )
+    return await get_suggestions_svc(db, current_user.id, limit)
+
+
+@router.get("/{username}/mutuals", response_model=MutualList)
+async def get_mutuals(
+    username: str,
+    token: str,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    current_user = await get_current_principal(token, db)
+    if not current_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token"
+        )
+    if not follow_graph.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="follow graph is not loaded",
+        )
+
+    mutuals = await get_mutuals_svc(db, current_user.id, username, limit)
+    if mutuals is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Invaild username"
+        )
+    return mutuals
@@ -16,6 +16,7 @@ class Profile(UserBase):
 
 class UserSchema(BaseModel):
     profile_pic: Optional[str] = None
+    profile_pic_thumb: Optional[str] = None
     username: str
     name: Optional[str] = None
 
@@ -25,7 +26,22 @@ class UserSchema(BaseModel):
 
 class FollowerList(BaseModel):
     followers: list[UserSchema] = []
+    next_cursor: Optional[int] = None
 
 
 class FollowingList(BaseModel):
     followings: list[UserSchema] = []
+    next_cursor: Optional[int] = None
+
+
+class MutualList(BaseModel):
+    users: list[UserSchema] = []
+    count: int = 0
+
+
+class Suggestion(UserSchema):
+    mutual_count: int
+
+
+class SuggestionList(BaseModel):
+    suggestions: list[Suggestion] = []
@@ -1,12 +1,34 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.activity.models import Activity
+from app.activity.service import record_activity_groups_svc
 from app.auth.models import Follow, User
-from app.auth.service import existing_user, get_user_by_user_id, get_user_by_username
-from app.profile.schemas import FollowerList, FollowingList
+from app.auth.service import existing_user, get_user_by_username
+from app.core.config import settings
+from app.media.service import thumbnail_url
+from app.profile.graph import follow_graph
+from app.profile.schemas import (
+    FollowerList,
+    FollowingList,
+    MutualList,
+    Suggestion,
+    SuggestionList,
+)
+
+
+async def get_follow(db: AsyncSession, follower_id: int, following_id: int) -> Follow:
+    result = await db.execute(
+        select(Follow).where(
+            Follow.follower_id == follower_id, Follow.following_id == following_id
+        )
+    )
+    return result.scalars().first()
 
 
-async def follow_svc(db: Session, follower: str, following: str):
+async def follow_svc(db: AsyncSession, follower: str, following: str):
     db_follower_exist = await existing_user(follower, "", db)
     db_following_exist = await existing_user(following, "", db)
 
@@ -16,16 +38,13 @@ async def follow_svc(db: Session, follower: str, following: str):
     db_follower = await get_user_by_username(follower, db)
     db_following = await get_user_by_username(following, db)
 
-    db_follow = (
-        db.query(Follow)
-        .filter_by(follower_id=db_follower.id, following_id=db_following.id)
-        .first()
-    )
+    db_follow = await get_follow(db, db_follower.id, db_following.id)
 
     if db_follow:
         return False
 
-    db_follow = Follow(follower_id=db_follower.id, following_id=db_following.id)
+    follower_id, following_id = db_follower.id, db_following.id
+    db_follow = Follow(follower_id=follower_id, following_id=following_id)
     db.add(db_follow)
 
     db_follower.followings_count += 1
@@ -38,11 +57,22 @@ async def follow_svc(db: Session, follower: str, following: str):
     )
 
     db.add(follow_activity)
-    db.commit()
-    db.refresh(follow_activity)
+    await record_activity_groups_svc(
+        db,
+        [
+            {
+                "username": db_following.username,
+                "followed_username": db_follower.username,
+                "followed_user_pic": db_follower.profile_pic,
+            }
+        ],
+    )
+    await db.commit()
+    follow_graph.add(follower_id, following_id)
+    await db.refresh(follow_activity)
 
 
-async def unfollow_svc(db: Session, follower: str, following: str):
+async def unfollow_svc(db: AsyncSession, follower: str, following: str):
     db_follower_exist = await existing_user(follower, "", db)
     db_following_exist = await existing_user(following, "", db)
 
@@ -52,70 +82,118 @@ async def unfollow_svc(db: Session, follower: str, following: str):
     db_follower = await get_user_by_username(follower, db)
     db_following = await get_user_by_username(following, db)
 
-    db_follow = (
-        db.query(Follow)
-        .filter_by(follower_id=db_follower.id, following_id=db_following.id)
-        .first()
-    )
+    db_follow = await get_follow(db, db_follower.id, db_following.id)
 
     if not db_follow:
         return False
 
-    db.delete(db_follow)
+    await db.delete(db_follow)
 
+    follower_id, following_id = db_follower.id, db_following.id
     db_follower.followings_count -= 1
     db_following.followers_count -= 1
 
-    db.commit()
+    await db.commit()
+    follow_graph.remove(follower_id, following_id)
 
 
-async def get_followers_svc(db: Session, user_id: int) -> list[FollowerList]:
-    db_user = await get_user_by_user_id(db, user_id)
+def follow_page_query(user_column, where, before: Optional[int], limit: int):
+    # 필요한 컬럼만 한 번의 join으로, 상대 user id 내림차순 keyset 페이지네이션
+    query = (
+        select(
+            User.id,
+            User.profile_pic,
+            User.name,
+            User.username,
+            thumbnail_url(User.profile_pic).label("profile_pic_thumb"),
+        )
+        .join(Follow, user_column == User.id)
+        .where(where)
+    )
+    if before is not None:
+        query = query.where(user_column < before)
+    return query.order_by(user_column.desc()).limit(limit)
 
-    if not db_user:
-        return []
 
-    db_followers = (
-        db.query(Follow)
-        .filter_by(following_id=user_id)
-        .join(User, User.id == Follow.follower_id)
-        .all()
-    )
+def user_summary(user) -> dict:
+    return {
+        "profile_pic": user.profile_pic,
+        "profile_pic_thumb": user.profile_pic_thumb,
+        "name": user.name,
+        "username": user.username,
+    }
 
-    followers = []
-    for user in db_followers:
-        followers.append(
-            {
-                "profile_pic": user.follower.profie_pic,
-                "name": user.follower.name,
-                "username": user.follower.username,
-            }
+
+def follow_page(rows, limit: int) -> tuple[list[dict], Optional[int]]:
+    users = [user_summary(user) for user in rows]
+    next_cursor = rows[-1].id if len(rows) == limit else None
+    return users, next_cursor
+
+
+async def get_followers_svc(
+    db: AsyncSession, user_id: int, before: Optional[int] = None, limit: int = 50
+) -> FollowerList:
+    result = await db.execute(
+        follow_page_query(
+            Follow.follower_id, Follow.following_id == user_id, before, limit
         )
+    )
+    followers, next_cursor = follow_page(result.all(), limit)
+    return FollowerList(followers=followers, next_cursor=next_cursor)
 
-    return FollowerList(followers=followers)
 
+async def get_followings_svc(
+    db: AsyncSession, user_id: int, before: Optional[int] = None, limit: int = 50
+) -> FollowingList:
+    result = await db.execute(
+        follow_page_query(
+            Follow.following_id, Follow.follower_id == user_id, before, limit
+        )
+    )
+    followings, next_cursor = follow_page(result.all(), limit)
+    return FollowingList(followings=followings, next_cursor=next_cursor)
+
+
+async def get_users_by_ids(db: AsyncSession, user_ids: list[int]) -> dict[int, dict]:
+    # 그래프에서 구한 id의 사용자 정보를 필요한 컬럼만 한 번에 가져온다
+    if not user_ids:
+        return {}
+    result = await db.execute(
+        select(
+            User.id,
+            User.profile_pic,
+            User.name,
+            User.username,
+            thumbnail_url(User.profile_pic).label("profile_pic_thumb"),
+        ).where(User.id.in_(user_ids))
+    )
+    return {user.id: user_summary(user) for user in result.all()}
 
-async def get_followings_svc(db: Session, user_id: int) -> list[FollowingList]:
-    db_user = await get_user_by_user_id(db, user_id)
 
-    if not db_user:
-        return []
+async def get_mutuals_svc(
+    db: AsyncSession, viewer_id: int, username: str, limit: int
+) -> Optional[MutualList]:
+    user_id = await db.scalar(select(User.id).where(User.username == username))
+    if user_id is None:
+        return None
 
-    db_followings = (
-        db.query(Follow)
-        .filter_by(follower_id=user_id)
-        .join(User, User.id == Follow.following_id)
-        .all()
+    mutual_ids = follow_graph.mutual_followers(viewer_id, user_id)
+    users = await get_users_by_ids(db, mutual_ids[:limit])
+    return MutualList(
+        users=[users[user_id] for user_id in mutual_ids[:limit] if user_id in users],
+        count=len(mutual_ids),
     )
 
-    following = []
-    for user in db_followings:
-        following.append(
-            {
-                "profile_pic": user.follower.profile_pic,
-                "name": user.follower.name,
-                "username": user.follower.username,
-            }
-        )
 
-    return FollowingList(followings=following)
+async def get_suggestions_svc(
+    db: AsyncSession, user_id: int, limit: int
+) -> SuggestionList:
+    suggestions = follow_graph.suggestions(user_id, limit, settings.SUGGESTION_FANOUT)
+    users = await get_users_by_ids(db, [user_id for user_id, _ in suggestions])
+    return SuggestionList(
+        suggestions=[
+            Suggestion(**users[user_id], mutual_count=mutual_count)
+            for user_id, mutual_count in suggestions
+            if user_id in users
+        ]
+    )
@@ -0,0 +1,18 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.profile.graph import follow_graph
+
+logger = logging.getLogger(__name__)
+
+
+async def follow_graph_refresher():
+    while True:
+        await asyncio.sleep(settings.FOLLOW_GRAPH_REBUILD_INTERVAL)
+        try:
+            async with SessionLocal() as db:
+                await follow_graph.rebuild(db, settings.FOLLOW_GRAPH_LOAD_BATCH)
+        except Exception:
+            logger.exception("follow graph rebuild failed")
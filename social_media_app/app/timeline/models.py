@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+
+from app.core.db import Base
+
+
+class TimelineEntry(Base):
+    __tablename__ = "timeline_entries"
+
+    # (user_id, post_id) PK 인덱스 하나로 타임라인 범위 조회
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id"), primary_key=True)
+    created_dt = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (Index("ix_timeline_entries_post_id", "post_id"),)
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.post.schemas import Post
+
+
+class TimelinePost(Post):
+    username: str
+
+
+class Timeline(BaseModel):
+    posts: list[TimelinePost] = []
+    next_cursor: Optional[int] = None
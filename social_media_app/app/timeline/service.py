@@ -0,0 +1,66 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.auth.models import Follow, User
+from app.core.config import settings
+from app.post.like_buffer import post_with_pending_likes
+from app.post.models import Post
+from app.timeline.schemas import Timeline, TimelinePost
+from app.timeline.store import timeline_store
+
+
+async def fan_out_post_svc(db: AsyncSession, post: Post, followers_count: int):
+    # 팔로워가 많은 계정은 쓰기 시 전파하지 않고 읽을 때 합친다
+    # 나중에 팔로워가 줄어도 읽을 때 합치도록 게시물에 표시해 둔다
+    if followers_count > settings.TIMELINE_CELEBRITY_THRESHOLD:
+        post.timeline_pull = True
+        await timeline_store.push(db, [post.author_id], post.id)
+    else:
+        await timeline_store.fan_out(db, post.author_id, post.id)
+    await db.commit()
+
+
+async def get_pull_post_ids(
+    db: AsyncSession, user_id: int, before: Optional[int], limit: int
+) -> list[int]:
+    # 팔로우하는 작성자의 timeline_pull 게시물, 부분 인덱스로 읽는다
+    query = (
+        select(Post.id)
+        .join(Follow, Follow.following_id == Post.author_id)
+        .where(Follow.follower_id == user_id, Post.timeline_pull)
+    )
+    if before is not None:
+        query = query.where(Post.id < before)
+
+    result = await db.execute(query.order_by(Post.id.desc()).limit(limit))
+    return result.scalars().all()
+
+
+async def get_timeline_svc(
+    db: AsyncSession, user_id: int, before: Optional[int] = None, limit: int = 10
+) -> Timeline:
+    post_ids = await timeline_store.range(db, user_id, before, limit)
+    pull_post_ids = await get_pull_post_ids(db, user_id, before, limit)
+
+    post_ids = sorted(set(post_ids) | set(pull_post_ids), reverse=True)[:limit]
+    if not post_ids:
+        return Timeline()
+
+    result = await db.execute(
+        select(Post, User.username)
+        .join(User, Post.author_id == User.id)
+        .options(selectinload(Post.hashtags))
+        .where(Post.id.in_(post_ids))
+        .order_by(Post.id.desc())
+    )
+
+    posts = []
+    for post, username in result.all():
+        post_data = post_with_pending_likes(post)
+        posts.append(TimelinePost(**post_data.model_dump(), username=username))
+
+    next_cursor = post_ids[-1] if len(post_ids) == limit else None
+    return Timeline(posts=posts, next_cursor=next_cursor)
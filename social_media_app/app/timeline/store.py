@@ -0,0 +1,148 @@
+import bisect
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from sqlalchemy import delete, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.auth.models import Follow, User
+from app.core.config import settings
+from app.timeline.models import TimelineEntry
+
+
+class TimelineStore(ABC):
+    """팔로워별 타임라인(post id 목록) 저장소"""
+
+    @abstractmethod
+    async def fan_out(self, db: AsyncSession, author_id: int, post_id: int): ...
+
+    @abstractmethod
+    async def push(self, db: AsyncSession, user_ids: list[int], post_id: int): ...
+
+    @abstractmethod
+    async def range(
+        self, db: AsyncSession, user_id: int, before: Optional[int], limit: int
+    ) -> list[int]: ...
+
+    @abstractmethod
+    async def remove(self, db: AsyncSession, post_id: int): ...
+
+
+class InMemoryTimelineStore(TimelineStore):
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+        # user_id -> 오름차순 post id 목록
+        self.timelines: dict[int, list[int]] = {}
+
+    async def fan_out(self, db: AsyncSession, author_id: int, post_id: int):
+        result = await db.execute(
+            select(Follow.follower_id).where(Follow.following_id == author_id)
+        )
+        await self.push(db, [author_id, *result.scalars().all()], post_id)
+
+    async def push(self, db: AsyncSession, user_ids: list[int], post_id: int):
+        for user_id in user_ids:
+            timeline = self.timelines.setdefault(user_id, [])
+            bisect.insort(timeline, post_id)
+            if len(timeline) > self.max_length:
+                del timeline[: len(timeline) - self.max_length]
+
+    async def range(
+        self, db: AsyncSession, user_id: int, before: Optional[int], limit: int
+    ) -> list[int]:
+        timeline = self.timelines.get(user_id, [])
+        end = len(timeline) if before is None else bisect.bisect_left(timeline, before)
+        return timeline[max(end - limit, 0) : end][::-1]
+
+    async def remove(self, db: AsyncSession, post_id: int):
+        for timeline in self.timelines.values():
+            index = bisect.bisect_left(timeline, post_id)
+            if index < len(timeline) and timeline[index] == post_id:
+                del timeline[index]
+
+
+class PostgresTimelineStore(TimelineStore):
+    def __init__(self, max_length: int, trim_every: int):
+        self.max_length = max_length
+        self.trim_every = trim_every
+
+    async def fan_out(self, db: AsyncSession, author_id: int, post_id: int):
+        followers = select(Follow.follower_id, literal(post_id)).where(
+            Follow.following_id == author_id
+        )
+        await db.execute(
+            insert(TimelineEntry)
+            .from_select(["user_id", "post_id"], followers)
+            .on_conflict_do_nothing()
+        )
+        await self.push(db, [author_id], post_id)
+
+        # 팔로워 전체를 매번 정리하면 쓰기가 무거워지므로 trim_every개 게시물마다 한 번,
+        # 타임라인은 평균 max_length + trim_every 안쪽으로 유지된다
+        if post_id % self.trim_every == 0:
+            await self.trim(
+                db,
+                select(Follow.follower_id.label("user_id"))
+                .where(Follow.following_id == author_id)
+                .subquery(),
+            )
+
+    async def push(self, db: AsyncSession, user_ids: list[int], post_id: int):
+        await db.execute(
+            insert(TimelineEntry)
+            .values([{"user_id": user_id, "post_id": post_id} for user_id in user_ids])
+            .on_conflict_do_nothing()
+        )
+        await self.trim(
+            db, select(User.id.label("user_id")).where(User.id.in_(user_ids)).subquery()
+        )
+
+    async def range(
+        self, db: AsyncSession, user_id: int, before: Optional[int], limit: int
+    ) -> list[int]:
+        query = select(TimelineEntry.post_id).where(TimelineEntry.user_id == user_id)
+        if before is not None:
+            query = query.where(TimelineEntry.post_id < before)
+        result = await db.execute(
+            query.order_by(TimelineEntry.post_id.desc()).limit(limit)
+        )
+        return result.scalars().all()
+
+    async def trim(self, db: AsyncSession, users):
+        # 사용자마다 max_length번째 다음 항목을 인덱스로 찾아 그 이하를 지운다, commit은 호출한 쪽에서
+        entry = aliased(TimelineEntry)
+        cutoff = (
+            select(entry.post_id)
+            .where(entry.user_id == users.c.user_id)
+            .order_by(entry.post_id.desc())
+            .offset(self.max_length)
+            .limit(1)
+            .scalar_subquery()
+        )
+        cutoffs = select(users.c.user_id, cutoff.label("post_id")).subquery()
+        expired = select(TimelineEntry.user_id, TimelineEntry.post_id).join(
+            cutoffs,
+            (TimelineEntry.user_id == cutoffs.c.user_id)
+            & (TimelineEntry.post_id <= cutoffs.c.post_id),
+        )
+        await db.execute(
+            delete(TimelineEntry)
+            .where(tuple_(TimelineEntry.user_id, TimelineEntry.post_id).in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def remove(self, db: AsyncSession, post_id: int):
+        await db.execute(delete(TimelineEntry).where(TimelineEntry.post_id == post_id))
+
+
+def create_timeline_store() -> TimelineStore:
+    if settings.TIMELINE_BACKEND == "memory":
+        return InMemoryTimelineStore(settings.TIMELINE_MAX_LENGTH)
+    return PostgresTimelineStore(
+        settings.TIMELINE_MAX_LENGTH, settings.TIMELINE_TRIM_EVERY
+    )
+
+
+timeline_store = create_timeline_store()
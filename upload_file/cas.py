@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from storage import MAX_UPLOAD_SIZE, save_stream
+
+CAS_DIR = os.getenv("CAS_DIR", "./blobs")
+CAS_INDEX = os.getenv("CAS_INDEX", os.path.join(CAS_DIR, "index.sqlite3"))
+
+
+@dataclass
+class Blob:
+    name: str
+    sha256: str
+    size: int
+    path: str
+    deduplicated: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "filename": self.name,
+            "path": self.path,
+            "size": self.size,
+            "sha256": self.sha256,
+            "deduplicated": self.deduplicated,
+        }
+
+
+def blob_path(sha256: str) -> str:
+    # ab/cd/<sha256> 형태로 샤딩
+    return os.path.join(CAS_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+class ContentStore:
+    """sha256 기준 blob 저장소와 이름 -> blob 참조 카운트 인덱스"""
+
+    def __init__(self, index_path: str):
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(
+            index_path, check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                refcount INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS names (
+                name TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL REFERENCES blobs (sha256)
+            );
+            """)
+        # blob 파일 생성/삭제와 인덱스 갱신을 한 번에 처리
+        self._lock = threading.Lock()
+
+    def _release(self, sha256: str):
+        self._db.execute(
+            "UPDATE blobs SET refcount = refcount - 1 WHERE sha256 = ?", (sha256,)
+        )
+        row = self._db.execute(
+            "SELECT refcount FROM blobs WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+        if row and row[0] <= 0:
+            self._db.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+            try:
+                os.unlink(blob_path(sha256))
+            except FileNotFoundError:
+                pass
+
+    def _link(self, name: str, sha256: str, size: int):
+        old = self._db.execute(
+            "SELECT sha256 FROM names WHERE name = ?", (name,)
+        ).fetchone()
+        if old and old[0] == sha256:
+            return
+
+        self._db.execute(
+            "INSERT INTO blobs (sha256, size, refcount) VALUES (?, ?, 1) "
+            "ON CONFLICT (sha256) DO UPDATE SET refcount = refcount + 1",
+            (sha256, size),
+        )
+        self._db.execute(
+            "INSERT INTO names (name, sha256) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET sha256 = excluded.sha256",
+            (name, sha256),
+        )
+        if old:
+            self._release(old[0])
+
+    def lookup(self, sha256: str) -> Optional[int]:
+        row = self._db.execute(
+            "SELECT size FROM blobs WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def resolve(self, name: str) -> Optional[Blob]:
+        row = self._db.execute(
+            "SELECT b.sha256, b.size FROM names n JOIN blobs b USING (sha256) "
+            "WHERE n.name = ?",
+            (name,),
+        ).fetchone()
+        if row is None:
+            return None
+        return Blob(name, row[0], row[1], blob_path(row[0]))
+
+    def ingest(self, name: str, path: str, sha256: str, size: int) -> Blob:
+        """임시 경로의 파일을 blob으로 옮기고 이름을 연결, 중복이면 파일만 버린다"""
+        target = blob_path(sha256)
+        with self._lock:
+            deduplicated = self.lookup(sha256) is not None
+            if deduplicated:
+                os.unlink(path)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(path, target)
+
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._link(name, sha256, size)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return Blob(name, sha256, size, target, deduplicated)
+
+    def unlink(self, name: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sha256 FROM names WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                return False
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM names WHERE name = ?", (name,))
+                self._release(row[0])
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return True
+
+
+content_store = ContentStore(CAS_INDEX)
+
+
+def incoming_path() -> str:
+    return os.path.join(CAS_DIR, "incoming", uuid.uuid4().hex)
+
+
+async def put_stream(
+    chunks: AsyncIterator[bytes], name: str, max_size: int = MAX_UPLOAD_SIZE
+) -> Blob:
+    stored = await save_stream(chunks, incoming_path(), max_size=max_size)
+    return await asyncio.to_thread(
+        content_store.ingest, name, stored.path, stored.sha256, stored.size
+    )
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+async def put_file(path: str, name: str) -> Blob:
+    # 이미 디스크에 있는 파일(조립된 resumable 업로드 등)을 저장
+    sha256 = await asyncio.to_thread(_hash_file, path)
+    size = await asyncio.to_thread(os.path.getsize, path)
+    return await asyncio.to_thread(content_store.ingest, name, path, sha256, size)
@@ -0,0 +1,260 @@
+import asyncio
+import mimetypes
+import os
+import uuid
+from typing import BinaryIO, Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from cas import content_store
+from storage import CHUNK_SIZE, safe_filename
+
+MAX_RANGES = int(os.getenv("DOWNLOAD_MAX_RANGES", "16"))
+
+router = APIRouter(prefix="/files", tags=["files"])
+
+
+def parse_range(header: str, size: int) -> Optional[list[tuple[int, int]]]:
+    """Range 헤더 해석, 형식이 틀리면 None (전체 응답), 만족할 수 없으면 []"""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    ranges = []
+    for part in spec.split(","):
+        first, sep, last = part.strip().partition("-")
+        if not sep:
+            return None
+        if not first:
+            # bytes=-500 (마지막 500바이트)
+            if not last.isdigit():
+                return None
+            length = int(last)
+            if length:
+                ranges.append((max(0, size - length), size - 1))
+            continue
+        if not first.isdigit() or (last and not last.isdigit()):
+            return None
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start < size:
+            end = int(last) if last else size - 1
+            ranges.append((start, min(end, size - 1)))
+
+    # 겹치거나 붙어 있는 구간은 합친다
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    if len(merged) > MAX_RANGES:
+        return None
+    return merged
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in tags
+
+
+class FileRangeResponse(Response):
+    """파일 구간을 보내는 응답, 서버가 지원하면 zerocopysend/pathsend로 전송
+
+    두 확장은 서버가 scope["extensions"]에 광고할 때만 쓴다. 이 프로젝트의
+    uvicorn은 어느 쪽도 광고하지 않으므로 pread 경로로 보내고, pathsend는
+    Granian 같은 서버에서 전체 파일 응답에 쓰인다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        ranges: Optional[list[tuple[int, int]]],
+        media_type: str,
+        headers: dict,
+        send_body: bool = True,
+    ):
+        self.path = path
+        self.size = size
+        self.ranges = ranges
+        self.send_body = send_body
+        self.parts: list[tuple[bytes, int, int]] = []
+
+        if ranges is None:
+            super().__init__(status_code=status.HTTP_200_OK, headers=headers)
+            self.headers["content-type"] = media_type
+            content_length = size
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            super().__init__(
+                status_code=status.HTTP_206_PARTIAL_CONTENT, headers=headers
+            )
+            self.headers["content-type"] = media_type
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+            content_length = end - start + 1
+        else:
+            boundary = uuid.uuid4().hex
+            super().__init__(
+                status_code=status.HTTP_206_PARTIAL_CONTENT, headers=headers
+            )
+            self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+            content_length = 0
+            for start, end in ranges:
+                part_header = (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {media_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+                ).encode()
+                self.parts.append((part_header, start, end - start + 1))
+                content_length += len(part_header) + end - start + 1 + 2
+            self.trailer = f"--{boundary}--\r\n".encode()
+            content_length += len(self.trailer)
+
+        self.headers["content-length"] = str(content_length)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            file = await asyncio.to_thread(open, self.path, "rb")
+        except FileNotFoundError:
+            await Response(status_code=status.HTTP_404_NOT_FOUND)(scope, receive, send)
+            return
+
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            if not self.send_body:
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            extensions = scope.get("extensions") or {}
+            if self.ranges is None and "http.response.pathsend" in extensions:
+                await send({"type": "http.response.pathsend", "path": self.path})
+            elif self.ranges is None:
+                await self._send_range(send, extensions, file, 0, self.size, False)
+            elif not self.parts:
+                start, end = self.ranges[0]
+                await self._send_range(
+                    send, extensions, file, start, end - start + 1, False
+                )
+            else:
+                for part_header, offset, count in self.parts:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": part_header,
+                            "more_body": True,
+                        }
+                    )
+                    await self._send_range(send, extensions, file, offset, count, True)
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": b"\r\n",
+                            "more_body": True,
+                        }
+                    )
+                await send({"type": "http.response.body", "body": self.trailer})
+        finally:
+            file.close()
+
+    async def _send_range(
+        self,
+        send: Send,
+        extensions: dict,
+        file: BinaryIO,
+        offset: int,
+        count: int,
+        more: bool,
+    ):
+        if "http.response.zerocopysend" in extensions:
+            # 커널이 파일에서 소켓으로 바로 보낸다, 확장 스펙상 file은 파일 객체
+            await send(
+                {
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": offset,
+                    "count": count,
+                    "more_body": more,
+                }
+            )
+            return
+
+        # 지원하지 않는 서버에서는 pread로 청크 단위 전송
+        end = offset + count
+        while offset < end:
+            chunk = await asyncio.to_thread(
+                os.pread, file.fileno(), min(CHUNK_SIZE, end - offset), offset
+            )
+            if not chunk:
+                # Content-Length를 채울 수 없으므로 응답을 끊는다 (서버가 연결을 닫음)
+                raise RuntimeError(
+                    f"{self.path} is shorter than expected ({offset} < {end})"
+                )
+            offset += len(chunk)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": more or offset < end,
+                }
+            )
+        if count == 0 and not more:
+            await send({"type": "http.response.body", "body": b""})
+
+
+@router.api_route("/{filename}", methods=["GET", "HEAD"])
+async def download_file(filename: str, request: Request):
+    try:
+        name = safe_filename(filename)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND) from exc
+
+    blob = await asyncio.to_thread(content_store.resolve, name)
+    if blob is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    # 내용 해시가 곧 ETag
+    etag = f'"{blob.sha256}"'
+    headers = {
+        "etag": etag,
+        "accept-ranges": "bytes",
+        "cache-control": "no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    ranges = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # If-Range가 현재 ETag와 다르면 Range를 무시하고 전체를 보낸다
+    if range_header and (if_range is None or if_range.strip() == etag):
+        ranges = parse_range(range_header, blob.size)
+        if ranges == []:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "content-range": f"bytes */{blob.size}"},
+            )
+
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    return FileRangeResponse(
+        blob.path,
+        blob.size,
+        ranges,
+        media_type,
+        headers,
+        send_body=request.method != "HEAD",
+    )
@@ -1,19 +1,99 @@
-import os
+import asyncio
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, File, UploadFile
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile, status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-app = FastAPI()
+import download
+import resumable
+from cas import content_store, put_stream
+from storage import CHUNK_SIZE, MAX_UPLOAD_SIZE, UploadTooLarge, rechunk, safe_filename
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweeper = asyncio.create_task(resumable.run_sweeper())
+
+    yield
+
+    sweeper.cancel()
+    await asyncio.gather(sweeper, return_exceptions=True)
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.include_router(resumable.router)
+app.include_router(download.router)
+
+
+class ContentLengthLimit:
+    """multipart 파싱보다 먼저 Content-Length로 거절
+
+    BaseHTTPMiddleware는 zerocopysend/pathsend 메시지를 통과시키지 못하므로
+    순수 ASGI 미들웨어로 둔다.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            content_length = Headers(scope=scope).get("content-length", "")
+            if content_length.isdigit() and int(content_length) > self.max_size:
+                response = JSONResponse(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    content={"detail": "file too large"},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(ContentLengthLimit, max_size=MAX_UPLOAD_SIZE)
+
+
+def logical_name(filename: str) -> str:
+    try:
+        return safe_filename(filename)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid filename"
+        ) from exc
+
+
+async def store(chunks, filename: str) -> dict:
+    try:
+        blob = await put_stream(chunks, logical_name(filename))
+    except UploadTooLarge as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="file too large",
+        ) from exc
+
+    return blob.to_dict()
 
 
 @app.post("/upload/")
-async def upload_file(file: UploadFile = File(...)) -> str:
-    upload_dir = "./uploads"
-    if not os.path.exists(upload_dir):
-        os.makedirs(upload_dir)
+async def upload_file(file: UploadFile = File(...)) -> dict:
+    async def chunks():
+        while chunk := await file.read(CHUNK_SIZE):
+            yield chunk
+
+    return await store(chunks(), file.filename)
+
 
-    file_path = os.path.join(upload_dir, file.filename)
+# multipart 파싱 없이 요청 본문을 그대로 스트리밍
+# 중복 제거는 받은 본문으로 서버가 계산한 해시로만 한다
+@app.put("/upload/{filename}")
+async def upload_raw(filename: str, request: Request) -> dict:
+    return await store(rechunk(request.stream(), CHUNK_SIZE), filename)
 
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
 
-    return {"filename": file.filename, "path": file_path}
+@app.delete("/files/{filename}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_file(filename: str):
+    deleted = await asyncio.to_thread(content_store.unlink, logical_name(filename))
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,272 @@
+import asyncio
+import errno
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from pydantic import BaseModel
+
+from cas import incoming_path, put_file
+from storage import (
+    CHUNK_SIZE,
+    MAX_UPLOAD_SIZE,
+    UPLOAD_DIR,
+    UploadTooLarge,
+    commit_temp,
+    create_temp,
+    discard_temp,
+    rechunk,
+    safe_filename,
+    save_stream,
+)
+
+STAGING_DIR = os.getenv("UPLOAD_STAGING_DIR", os.path.join(UPLOAD_DIR, ".staging"))
+DEFAULT_PART_SIZE = int(os.getenv("UPLOAD_PART_SIZE", str(8 * 1024 * 1024)))
+SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", "86400"))
+SWEEP_INTERVAL = int(os.getenv("UPLOAD_SWEEP_INTERVAL", "600"))
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+# 같은 세션에 complete가 동시에 들어오지 않도록
+_completing: set[str] = set()
+
+
+class UploadInit(BaseModel):
+    filename: str
+    size: int
+    part_size: int = DEFAULT_PART_SIZE
+
+
+def session_dir(upload_id: str) -> str:
+    return os.path.join(STAGING_DIR, upload_id)
+
+
+def part_path(upload_id: str, index: int) -> str:
+    return os.path.join(session_dir(upload_id), f"{index:06d}.part")
+
+
+def part_count(meta: dict) -> int:
+    return max(1, -(-meta["size"] // meta["part_size"]))
+
+
+def part_length(meta: dict, index: int) -> int:
+    start = index * meta["part_size"]
+    return min(meta["part_size"], meta["size"] - start)
+
+
+def load_meta(upload_id: str) -> dict:
+    # upload_id는 uuid4 hex만 허용
+    if not re.fullmatch(r"[0-9a-f]{32}", upload_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    try:
+        with open(os.path.join(session_dir(upload_id), "meta.json")) as f:
+            return json.load(f)
+    except FileNotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="upload not found"
+        ) from exc
+
+
+def received_parts(upload_id: str) -> list[int]:
+    return sorted(
+        int(name.split(".")[0])
+        for name in os.listdir(session_dir(upload_id))
+        if name.endswith(".part")
+    )
+
+
+def _copy(src_fd: int, dst_fd: int, count: int):
+    # 커널 안에서 복사, copy_file_range가 안 되면 sendfile로
+    use_copy_file_range = hasattr(os, "copy_file_range")
+    while count > 0:
+        if use_copy_file_range:
+            try:
+                copied = os.copy_file_range(src_fd, dst_fd, count)
+            except OSError as exc:
+                if exc.errno not in (
+                    errno.EXDEV,
+                    errno.ENOSYS,
+                    errno.EINVAL,
+                    errno.EOPNOTSUPP,
+                ):
+                    raise
+                use_copy_file_range = False
+                continue
+        else:
+            copied = os.sendfile(dst_fd, src_fd, None, count)
+        if copied == 0:
+            raise OSError(errno.EIO, "unexpected end of part")
+        count -= copied
+
+
+def assemble(upload_id: str, meta: dict, path: str):
+    fd, tmp_path = create_temp(os.path.dirname(path))
+    try:
+        for index in range(part_count(meta)):
+            with open(part_path(upload_id, index), "rb") as part:
+                _copy(part.fileno(), fd, part_length(meta, index))
+    except BaseException:
+        discard_temp(fd, tmp_path)
+        raise
+    commit_temp(fd, tmp_path, path)
+    shutil.rmtree(session_dir(upload_id), ignore_errors=True)
+
+
+def sweep_expired() -> int:
+    # 마지막 청크 이후 SESSION_TTL이 지난 세션 삭제 (디렉터리 mtime 기준)
+    if not os.path.isdir(STAGING_DIR):
+        return 0
+
+    deadline = time.time() - SESSION_TTL
+    removed = 0
+    for entry in os.scandir(STAGING_DIR):
+        if entry.is_dir() and entry.stat().st_mtime < deadline:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+async def run_sweeper():
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            removed = await asyncio.to_thread(sweep_expired)
+            if removed:
+                logger.info("removed %d abandoned upload sessions", removed)
+        except Exception:
+            logger.exception("upload session sweep failed")
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def init_upload(upload: UploadInit) -> dict:
+    try:
+        filename = safe_filename(upload.filename)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid filename"
+        ) from exc
+    if upload.size < 0 or upload.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="file too large",
+        )
+    if upload.part_size < CHUNK_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"part_size must be at least {CHUNK_SIZE}",
+        )
+
+    upload_id = uuid.uuid4().hex
+    meta = {"filename": filename, "size": upload.size, "part_size": upload.part_size}
+
+    def create():
+        os.makedirs(session_dir(upload_id))
+        with open(os.path.join(session_dir(upload_id), "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    await asyncio.to_thread(create)
+    return {"upload_id": upload_id, "parts": part_count(meta), **meta}
+
+
+@router.get("/{upload_id}")
+async def get_upload(upload_id: str) -> dict:
+    meta = await asyncio.to_thread(load_meta, upload_id)
+    received = await asyncio.to_thread(received_parts, upload_id)
+    return {
+        "upload_id": upload_id,
+        "parts": part_count(meta),
+        "received": received,
+        **meta,
+    }
+
+
+@router.put("/{upload_id}/parts/{index}")
+async def upload_part(
+    upload_id: str,
+    index: int,
+    request: Request,
+    content_range: str = Header(None),
+) -> dict:
+    meta = await asyncio.to_thread(load_meta, upload_id)
+    if not 0 <= index < part_count(meta):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid part index"
+        )
+
+    start = index * meta["part_size"]
+    length = part_length(meta, index)
+    if content_range:
+        match = CONTENT_RANGE.fullmatch(content_range)
+        if (
+            not match
+            or int(match[1]) != start
+            or int(match[2]) != start + length - 1
+            or match[3] not in ("*", str(meta["size"]))
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail=f"part {index} must cover bytes {start}-{start + length - 1}",
+            )
+
+    try:
+        stored = await save_stream(
+            rechunk(request.stream(), CHUNK_SIZE),
+            part_path(upload_id, index),
+            max_size=length,
+        )
+    except UploadTooLarge as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="part too large",
+        ) from exc
+
+    if stored.size != length:
+        await asyncio.to_thread(os.unlink, stored.path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"part {index} must be {length} bytes",
+        )
+
+    return {"index": index, "size": stored.size, "sha256": stored.sha256}
+
+
+@router.post("/{upload_id}/complete")
+async def complete_upload(upload_id: str) -> dict:
+    meta = await asyncio.to_thread(load_meta, upload_id)
+    if upload_id in _completing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="upload is being completed"
+        )
+    # 검사와 등록 사이에 await가 없어야 두 요청이 함께 통과하지 않는다
+    _completing.add(upload_id)
+    try:
+        received = await asyncio.to_thread(received_parts, upload_id)
+        missing = sorted(set(range(part_count(meta))) - set(received))
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "missing parts", "missing": missing},
+            )
+
+        path = incoming_path()
+        await asyncio.to_thread(assemble, upload_id, meta, path)
+    finally:
+        _completing.discard(upload_id)
+
+    blob = await put_file(path, meta["filename"])
+    return blob.to_dict()
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(upload_id: str):
+    await asyncio.to_thread(load_meta, upload_id)
+    await asyncio.to_thread(shutil.rmtree, session_dir(upload_id), True)
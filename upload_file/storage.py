@@ -0,0 +1,90 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
+CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(5 * 1024 * 1024 * 1024)))
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+@dataclass
+class StoredFile:
+    path: str
+    size: int
+    sha256: str
+
+
+def safe_filename(filename: str) -> str:
+    # 경로 구분자를 제거해 업로드 디렉터리 밖으로 나가지 않도록
+    name = os.path.basename(filename or "")
+    if name in ("", ".", ".."):
+        raise ValueError("invalid filename")
+    return name
+
+
+async def rechunk(stream: AsyncIterator[bytes], size: int) -> AsyncIterator[bytes]:
+    # 서버가 넘겨주는 임의 크기 조각을 고정 크기 청크로 묶는다
+    buffer = bytearray()
+    async for data in stream:
+        buffer += data
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def _write_chunk(fd: int, hasher, chunk: bytes):
+    # hashlib과 os.write 모두 GIL을 놓으므로 워커 스레드에서 처리
+    hasher.update(chunk)
+    view = memoryview(chunk)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def create_temp(directory: str) -> tuple[int, str]:
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.mkstemp(dir=directory, prefix=".upload-")
+
+
+def commit_temp(fd: int, tmp_path: str, path: str):
+    os.fsync(fd)
+    os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def discard_temp(fd: int, tmp_path: str):
+    os.close(fd)
+    os.unlink(tmp_path)
+
+
+async def save_stream(
+    chunks: AsyncIterator[bytes],
+    path: str,
+    max_size: int = MAX_UPLOAD_SIZE,
+) -> StoredFile:
+    """청크를 임시 파일에 쓰면서 해시를 계산하고, 완료되면 path로 rename"""
+    fd, tmp_path = await asyncio.to_thread(create_temp, os.path.dirname(path) or ".")
+
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLarge(f"upload exceeds {max_size} bytes")
+            await asyncio.to_thread(_write_chunk, fd, hasher, chunk)
+    except BaseException:
+        await asyncio.to_thread(discard_temp, fd, tmp_path)
+        raise
+
+    await asyncio.to_thread(commit_temp, fd, tmp_path, path)
+    return StoredFile(path=path, size=size, sha256=hasher.hexdigest())
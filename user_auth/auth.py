@@ -4,11 +4,12 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.hash import pbkdf2_sha256
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from database import get_db
+from hashing import hash_password, verify_and_update_password
 from model import User
 from schemas import Token, UserCreate
 from setting import (
@@ -23,24 +24,24 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_user(db: db_dependency, create_user_request: UserCreate):
     create_user_model = User(
         username=create_user_request.username,
-        password_hash=pbkdf2_sha256.hash(create_user_request.password),
+        password_hash=await hash_password(create_user_request.password),
     )
     db.add(create_user_model)
-    db.commit()
+    await db.commit()
 
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: db_dependency
 ):
-    user = authenticate_user(form_data.username, form_data.password, db)
+    user = await authenticate_user(form_data.username, form_data.password, db)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate user."
@@ -75,7 +76,7 @@ async def refresh_access_token(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
             )
 
-        user = authenticate_user(username, None, db, is_refresh=True)
+        user = await authenticate_user(username, None, db, is_refresh=True)
 
         if not user:
             raise HTTPException(
@@ -94,14 +95,24 @@ async def refresh_access_token(
         ) from exc
 
 
-def authenticate_user(
+async def authenticate_user(
     username: str, password: str, db: db_dependency, is_refresh: bool = False
 ):
-    user = db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
     if not user:
         return False
-    if not is_refresh and not pbkdf2_sha256.verify(password, user.password_hash):
+    if is_refresh:
+        return user
+
+    verified, new_hash = await verify_and_update_password(password, user.password_hash)
+    if not verified:
         return False
+
+    # rounds 설정이 바뀌었으면 새 해시로 교체
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
     return user
 
 